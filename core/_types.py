@@ -8,8 +8,10 @@ from dataclasses import dataclass, replace as dataclass_replace, field
 from typing import Tuple, Optional
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Vec2:
+    """Vector/punto 2D inmutable. Con slots: sin __dict__ por instancia."""
+
     x: float
     y: float
 
@@ -33,7 +35,7 @@ class Vec2:
         return math.sqrt(dx * dx + dy * dy)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Segment:
     """
     Representa un segmento de pared o límite en el mapa.
@@ -43,6 +45,9 @@ class Segment:
     wall_type: Indica si la pared es 'solid' (normal) o 'portal' (dividida en secciones).
     portal_sections: Solo para wall_type='portal'. Lista de dicts con info de cada sección.
     NOTA: portal_sections se excluye de hash y comparación para permitir que Segment sea hashable.
+
+    Usa slots (sin __dict__ por instancia) y precalcula en __post_init__ los campos
+    derivados _dx, _dy y _len2, que no se pasan al constructor ni se comparan.
     """
 
     a: Vec2
@@ -71,20 +76,39 @@ class Segment:
         default=None, compare=False, hash=False, repr=False
     )
 
+    # --- Campos derivados, calculados una sola vez en __post_init__ ---
+    _dx: float = field(init=False, repr=False, compare=False)
+    _dy: float = field(init=False, repr=False, compare=False)
+    _len2: float = field(init=False, repr=False, compare=False)
+
     def __post_init__(self):
         """
         Si no se proporciona un segmento original asigna uno.
         Si es pared portal y no se definen secciones, inicializa como lista vacía.
+        Precalcula el vector director y su longitud al cuadrado.
         """
         if self.original_segment is None:
             object.__setattr__(self, "original_segment", self)
         if self.wall_type == "portal" and self.portal_sections is None:
             object.__setattr__(self, "portal_sections", [])
-
-    def length(self) -> float:
         dx = self.b.x - self.a.x
         dy = self.b.y - self.a.y
-        return math.sqrt(dx * dx + dy * dy)
+        object.__setattr__(self, "_dx", dx)
+        object.__setattr__(self, "_dy", dy)
+        object.__setattr__(self, "_len2", dx * dx + dy * dy)
+
+    def length(self) -> float:
+        return math.sqrt(self._len2)
+
+    @property
+    def dx(self) -> float:
+        """Componente x del vector director (b - a), precalculada."""
+        return self._dx
+
+    @property
+    def dy(self) -> float:
+        """Componente y del vector director (b - a), precalculada."""
+        return self._dy
 
     def as_tuple(self) -> Tuple[Tuple[float, float], Tuple[float, float]]:
         return (self.a.as_tuple(), self.b.as_tuple())
@@ -8,6 +8,8 @@ from typing import List, Optional, Sequence
 import logging
 import random
 
+import numpy as np
+
 from ._types import Segment, Vec2
 from utils.math_utils import split_segment
 from .errors import BSPBuildError
@@ -25,6 +27,21 @@ class BSPNode:
     map_data: "MapData" = (
         None  # Referencia al MapData asociado para visibilidad y lógica de juego
     )
+    # Recta de partición precalculada (ax, ay, dx, dy) para los tests de lado
+    plane: Optional[tuple[float, float, float, float]] = field(
+        default=None, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        if self.partition is not None and self.plane is None:
+            self.set_partition(self.partition)
+
+    def set_partition(self, partition: Segment) -> None:
+        """Asigna la partición y precalcula su recta como floats planos."""
+        self.partition = partition
+        a = partition.a
+        b = partition.b
+        self.plane = (a.x, a.y, b.x - a.x, b.y - a.y)
 
     def is_leaf(self) -> bool:
         return self.partition is None and not self.front and not self.back
@@ -45,7 +62,29 @@ class BSPBuilder:
 
     def build(self, segs: Sequence[Segment]) -> BSPNode:
         logger.debug("Construyendo BSP con %s segmentos", len(segs))
-        return self._build_recursive(list(segs), depth=0)
+        root = BSPNode()
+        segs = list(segs)
+        if not segs:
+            return root
+
+        # Pila explícita de (nodo a completar, segmentos, profundidad). El hijo front
+        # se apila último para procesarse primero: mismo orden que la versión recursiva.
+        stack = [(root, segs, 0)]
+        push = stack.append
+        pop = stack.pop
+        while stack:
+            node, node_segs, depth = pop()
+            if depth > self.max_depth:
+                continue  # Se queda como hoja vacía
+
+            front_list, back_list = self._split_node(node, node_segs)
+            if back_list:
+                node.back = BSPNode()
+                push((node.back, back_list, depth + 1))
+            if front_list:
+                node.front = BSPNode()
+                push((node.front, front_list, depth + 1))
+        return root
 
     def _choose_partition(self, segs: List[Segment]) -> Segment:
         if not segs:
@@ -55,42 +94,53 @@ class BSPBuilder:
         # otras estrategias futuras: median, longest...
         return segs[0]  # first
 
-    def _build_recursive(self, segs: List[Segment], depth: int) -> BSPNode:
-        if depth > self.max_depth or not segs:
-            return BSPNode()
-
+    def _split_node(
+        self, node: BSPNode, segs: List[Segment]
+    ) -> tuple[List[Segment], List[Segment]]:
+        """
+        Elige la partición del nodo, guarda en él los segmentos coplanares y
+        devuelve las listas de segmentos (ya divididos) de frente y de atrás.
+        """
         partition = self._choose_partition(segs)
-        node = BSPNode(partition=partition)
+        node.set_partition(partition)
+        coplanar_append = node.coplanar.append
 
         front_list: List[Segment] = []
         back_list: List[Segment] = []
-
-        # clasificación
-        for s in segs:
+        front_append = front_list.append
+        back_append = back_list.append
+        pa = partition.a
+        pb = partition.b
+
+        # Lado de ambos extremos de todos los segmentos respecto de la partición,
+        # en una pasada vectorizada (mismo cálculo que line_side)
+        n = len(segs)
+        ax, ay, dx, dy = node.plane
+        sax = np.fromiter((s.a.x for s in segs), dtype=np.float64, count=n)
+        say = np.fromiter((s.a.y for s in segs), dtype=np.float64, count=n)
+        sbx = np.fromiter((s.b.x for s in segs), dtype=np.float64, count=n)
+        sby = np.fromiter((s.b.y for s in segs), dtype=np.float64, count=n)
+        side_a = dx * (say - ay) - dy * (sax - ax)
+        side_b = dx * (sby - ay) - dy * (sbx - ax)
+        in_front = (side_a >= 0) & (side_b >= 0)
+        in_back = ~in_front & (side_a <= 0) & (side_b <= 0)
+
+        # clasificación. Los Segment son inmutables: los que no se dividen se
+        # comparten tal cual, solo se crean segmentos nuevos para las partes
+        for s, front, back in zip(segs, in_front.tolist(), in_back.tolist()):
 
             if s is partition:
-                node.coplanar.append(s.replace())
-                continue
-
-            front_parts, back_parts = split_segment(s, partition.a, partition.b)
-
-            if front_parts is None and back_parts is None:
-                # el segmento no cruza la partición, se queda en coplanar
-                node.coplanar.append(s.replace())
-                continue
-
-            if front_parts:
-                front_list.extend(
-                    [s.replace(a=part.a, b=part.b) for part in front_parts]
-                )
-                # front_list.extend(front_parts)
-            if back_parts:
-                back_list.extend([s.replace(a=part.a, b=part.b) for part in back_parts])
-                # back_list.extend(back_parts)
-
-        # recursión
-        node.front = (
-            self._build_recursive(front_list, depth + 1) if front_list else None
-        )
-        node.back = self._build_recursive(back_list, depth + 1) if back_list else None
-        return node
+                coplanar_append(s)
+            elif front:
+                front_append(s)
+            elif back:
+                back_append(s)
+            else:
+                # cruza la partición -> dividir conservando el resto de los atributos
+                front_parts, back_parts = split_segment(s, pa, pb)
+                for part in front_parts:
+                    front_append(s if part is s else s.replace(a=part.a, b=part.b))
+                for part in back_parts:
+                    back_append(s if part is s else s.replace(a=part.a, b=part.b))
+
+        return front_list, back_list
@@ -8,7 +8,6 @@ permitiendo portales y pasos visuales entre sectores con distintas alturas.
 
 from core._types import Vec2
 from core.bsp import BSPNode
-from utils.math_utils import line_side
 import math
 
 
@@ -36,29 +35,52 @@ class CollisionDetector:
         # Limpiar el último segmento colisionado antes de buscar
         self.last_collided_segment = None
 
-        def traverse(node: BSPNode):
+        # Recorrido iterativo del BSP con una pila explícita, sin una llamada
+        # recursiva por nodo. Se conserva el orden de visita: nodo, front, back.
+        stack = [self.bsp_root]
+        push = stack.append
+        pop = stack.pop
+        sx, sy = start.x, start.y
+        ex, ey = end.x, end.y
+        # Caja del trayecto ampliada por el radio (con holgura): un muro que no
+        # la toca no puede colisionar y se descarta sin calcular nada más
+        pad = radius + 1.0
+        min_x, max_x = min(sx, ex) - pad, max(sx, ex) + pad
+        min_y, max_y = min(sy, ey) - pad, max(sy, ey) + pad
+        while stack:
+            node = pop()
             if node is None or node.partition is None:
-                return
+                continue
             for seg in node.coplanar:
                 # Solo considerar segmentos que bloquean colisión
                 if hasattr(seg, "blocks_collision") and not seg.blocks_collision:
                     continue
+                a, b = seg.a, seg.b
+                if (
+                    (a.x < min_x and b.x < min_x)
+                    or (a.x > max_x and b.x > max_x)
+                    or (a.y < min_y and b.y < min_y)
+                    or (a.y > max_y and b.y > max_y)
+                ):
+                    continue
                 pt = self.segment_moving_circle_collision(
                     start, end, seg.a, seg.b, radius
                 )
                 if pt is not None and self.is_between(start, end, pt):
                     collisions.append((pt, seg))
-            side_start = line_side(start, node.partition.a, node.partition.b)
-            side_end = line_side(end, node.partition.a, node.partition.b)
+            # Mismo cálculo que line_side, con la recta precalculada del nodo
+            ax, ay, dx, dy = node.plane
+            side_start = dx * (sy - ay) - dy * (sx - ax)
+            side_end = dx * (ey - ay) - dy * (ex - ax)
             if side_start >= 0 and side_end >= 0:
-                traverse(node.front)
+                push(node.front)
             elif side_start <= 0 and side_end <= 0:
-                traverse(node.back)
+                push(node.back)
             else:
-                traverse(node.front)
-                traverse(node.back)
+                # back se apila primero para que front se procese antes
+                push(node.back)
+                push(node.front)
 
-        traverse(self.bsp_root)
         if not collisions:
             return None
         # Seleccionar el punto de colisión más cercano al inicio
@@ -90,15 +112,13 @@ class CollisionDetector:
         # Esto permite detectar colisión desde ambos lados de la pared (interior y exterior)
         col_points = []
 
+        # La longitud de la normal es la del segmento: una sola raíz para ambos sentidos
+        nlen = math.sqrt(seg_len2)
+
         for normal_sign in (+1, -1):
             # Calculamos la normal del segmento en ambos sentidos
-            nx = normal_sign * -(q2.y - q1.y)
-            ny = normal_sign * (q2.x - q1.x)
-            nlen = math.hypot(nx, ny)
-            if nlen == 0:
-                continue
-            nx /= nlen
-            ny /= nlen
+            nx = normal_sign * -f.y / nlen
+            ny = normal_sign * f.x / nlen
 
             # Distancia inicial desde el círculo al segmento (proyectado en la normal)
             dist0 = (p1.x - q1.x) * nx + (p1.y - q1.y) * ny
@@ -28,6 +28,11 @@ class Game:
         self.renderer = renderer
         self._running = False
         self._visible_cache = []
+        # Pose del jugador con la que se calculó _visible_cache
+        self._visible_key = None
+        # Con GPU_DEPTH_OCCLUSION el depth buffer resuelve la oclusión y el
+        # raycast en CPU se omite; el BSP se sigue usando para colisiones
+        self._cpu_occlusion = not getattr(settings, "GPU_DEPTH_OCCLUSION", False)
         self.collision = CollisionDetector(bsp_root)
         # Asegura la referencia cruzada entre BSPNode y MapData para visibilidad y lógica
         if hasattr(self.map_data, "set_bsp_root"):
@@ -53,9 +58,7 @@ class Game:
                 self._update(dt)
 
                 # Calcular la lógica del juego (visibilidad)
-                self._visible_cache = VisibilityManager.compute_visible_segments(
-                    self.bsp_root, self.player
-                )
+                self._update_visibility()
 
                 # Dibujar el frame en el buffer oculto
                 self.renderer.draw_frame(
@@ -69,6 +72,20 @@ class Game:
             self.renderer.shutdown()
             logger.info("Loop principal terminado y recursos liberados.")
 
+    def _update_visibility(self) -> None:
+        """
+        Recalcula los segmentos visibles solo si cambió la pose del jugador (posición,
+        ángulo o FOV); con el jugador quieto se reutiliza la lista del frame anterior.
+        """
+        p = self.player
+        key = (p.x, p.y, p.angle_deg, p.fov_deg, p.fov_length)
+        if key == self._visible_key:
+            return
+        self._visible_cache = VisibilityManager.compute_visible_segments(
+            self.bsp_root, p, occlusion=self._cpu_occlusion
+        )
+        self._visible_key = key
+
     def stop(self) -> None:
         self._running = False
 
@@ -115,18 +132,15 @@ class Game:
                 )
 
                 if nearest_seg is not None:
-                    # Calcular el vector tangente de la pared (normalizado)
+                    # Vector de la pared sin normalizar: la proyección divide por |w|²
                     wall_vec = nearest_seg.b - nearest_seg.a
-                    wall_len = math.hypot(wall_vec.x, wall_vec.y)
-                    if wall_len > 0:
-                        wall_tangent = type(wall_vec)(
-                            wall_vec.x / wall_len, wall_vec.y / wall_len
-                        )
-                        # Proyectar el movimiento original sobre el vector tangente (sliding)
-                        move_vec = type(wall_vec)(dx, dy)
-                        dot = move_vec.x * wall_tangent.x + move_vec.y * wall_tangent.y
-                        slide_dx = wall_tangent.x * dot
-                        slide_dy = wall_tangent.y * dot
+                    wall_len2 = wall_vec.x * wall_vec.x + wall_vec.y * wall_vec.y
+                    if wall_len2 > 0:
+                        # Proyectar el movimiento original sobre la pared (sliding):
+                        # (m·w / |w|²) * w, sin normalizar ni calcular la raíz
+                        k = (dx * wall_vec.x + dy * wall_vec.y) / wall_len2
+                        slide_dx = wall_vec.x * k
+                        slide_dy = wall_vec.y * k
                         # Intentar mover al jugador en la dirección deslizada
                         slide_end = type(start)(
                             self.player.x + slide_dx, self.player.y + slide_dy
@@ -5,9 +5,178 @@ Estructuras de datos para contener la información del mapa.
 from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional
+
+import numpy as np
+
 from ._types import Segment, Vec2
 
 
+@dataclass(frozen=True)
+class SegmentArrays:
+    """
+    Vista SoA (estructura de arrays NumPy) de una lista de segmentos.
+    Permite que los cálculos vectorizados (visibilidad, armado de paredes) no recorran
+    objetos Segment. Las coordenadas se guardan en float32: la mitad de memoria que los
+    Vec2 (float64), con precisión de sobra para filtrar y para los vértices que se suben
+    a la GPU; los Segment conservan los valores exactos.
+
+    xy es un único bloque (4, N) y ax, ay, bx, by son sus filas (vistas contiguas).
+    tex_id indexa texture_names (-1 si el segmento no tiene textura).
+    heights es (4, N): portal_h1_a, portal_h1_b, portal_h2_a, portal_h2_b.
+    facing vale 1 / 0 / -1 para interior_facing True / False / None.
+    sectioned marca los portales con portal_sections (se arman segmento a segmento).
+    draw_key es el índice del primer segmento con los mismos extremos y polígono.
+    """
+
+    xy: np.ndarray
+    is_portal: np.ndarray
+    tex_id: np.ndarray
+    texture_names: tuple[str, ...]
+    u_offset: np.ndarray
+    length: np.ndarray
+    heights: np.ndarray
+    facing: np.ndarray
+    sectioned: np.ndarray
+    draw_key: np.ndarray
+    # id(segmento) -> índice, para traducir listas de Segment a índices
+    _index: Dict[int, int] = field(repr=False, compare=False)
+    # Coordenadas de textura por escala, ver scaled_uv
+    _uv_cache: Dict[float, tuple] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+
+    @property
+    def ax(self) -> np.ndarray:
+        return self.xy[0]
+
+    @property
+    def ay(self) -> np.ndarray:
+        return self.xy[1]
+
+    @property
+    def bx(self) -> np.ndarray:
+        return self.xy[2]
+
+    @property
+    def by(self) -> np.ndarray:
+        return self.xy[3]
+
+    @classmethod
+    def from_segments(cls, segments: List[Segment]) -> "SegmentArrays":
+        """Construye los arrays a partir de una lista de segmentos."""
+        n = len(segments)
+        texture_names = tuple(
+            sorted({s.texture_name for s in segments if s.texture_name})
+        )
+        tex_index = {name: k for k, name in enumerate(texture_names)}
+
+        # Cada array se llena con un único fromiter (sin escrituras elemento a elemento);
+        # las coordenadas llegan intercaladas por segmento y se trasponen a filas
+        coords = np.fromiter(
+            (c for s in segments for c in (s.a.x, s.a.y, s.b.x, s.b.y)),
+            dtype=np.float32,
+            count=4 * n,
+        )
+        xy = np.ascontiguousarray(coords.reshape(n, 4).T)
+        is_portal = np.fromiter(
+            (s.wall_type == "portal" for s in segments), dtype=bool, count=n
+        )
+        tex_id = np.fromiter(
+            (tex_index.get(s.texture_name, -1) for s in segments),
+            dtype=np.int32,
+            count=n,
+        )
+        u_offset = np.fromiter(
+            (s.u_offset for s in segments), dtype=np.float32, count=n
+        )
+        length = np.fromiter((s.length() for s in segments), dtype=np.float32, count=n)
+        hs = np.fromiter(
+            (
+                h
+                for s in segments
+                for h in (s.portal_h1_a, s.portal_h1_b, s.portal_h2_a, s.portal_h2_b)
+            ),
+            dtype=np.float32,
+            count=4 * n,
+        )
+        heights = np.ascontiguousarray(hs.reshape(n, 4).T)
+        facing = np.fromiter(
+            (
+                -1 if s.interior_facing is None else int(bool(s.interior_facing))
+                for s in segments
+            ),
+            dtype=np.int8,
+            count=n,
+        )
+        sectioned = np.fromiter(
+            (s.wall_type == "portal" and bool(s.portal_sections) for s in segments),
+            dtype=bool,
+            count=n,
+        )
+        # Misma clave con la que el renderer evita dibujar dos veces una pared
+        first_by_key: Dict[tuple, int] = {}
+        draw_key = np.fromiter(
+            (
+                first_by_key.setdefault(
+                    (
+                        round(s.a.x, 5),
+                        round(s.a.y, 5),
+                        round(s.b.x, 5),
+                        round(s.b.y, 5),
+                        s.polygon_name,
+                    ),
+                    k,
+                )
+                for k, s in enumerate(segments)
+            ),
+            dtype=np.int32,
+            count=n,
+        )
+        return cls(
+            xy=xy,
+            is_portal=is_portal,
+            tex_id=tex_id,
+            texture_names=texture_names,
+            u_offset=u_offset,
+            length=length,
+            heights=heights,
+            facing=facing,
+            sectioned=sectioned,
+            draw_key=draw_key,
+            _index={id(s): k for k, s in enumerate(segments)},
+        )
+
+    def scaled_uv(self, tex_scale: float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Devuelve (u inicial, u final, heights / tex_scale) de todos los segmentos.
+        Se calculan la primera vez que se pide cada escala y luego solo se indexan.
+        """
+        uv = self._uv_cache.get(tex_scale)
+        if uv is None:
+            uv = (
+                self.u_offset / tex_scale,
+                (self.u_offset + self.length) / tex_scale,
+                self.heights / tex_scale,
+            )
+            self._uv_cache[tex_scale] = uv
+        return uv
+
+    def indices_of(self, segments) -> np.ndarray:
+        """
+        Devuelve los índices (int64) de una lista de segmentos de este mapa, en el mismo
+        orden; -1 para los que no pertenecen a la lista con que se construyeron los arrays.
+        """
+        index = self._index
+        return np.fromiter(
+            (index.get(id(s), -1) for s in segments),
+            dtype=np.int64,
+            count=len(segments),
+        )
+
+    def __len__(self) -> int:
+        return self.xy.shape[1]
+
+
 @dataclass
 class MapData:
     """
@@ -27,6 +196,10 @@ class MapData:
     # Nuevo: altura de suelo por sector
     sector_floor_h: Dict[str, float] = field(default_factory=dict)
     sector_ceil_h: Dict[str, float] = field(default_factory=dict)  # <--- NUEVO
+    # Caché de segment_arrays; se invalida al agregar segmentos
+    _segment_arrays: Optional[SegmentArrays] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     @classmethod
     def from_xmap(cls, xmap_data: dict) -> "MapData":
@@ -54,10 +227,28 @@ class MapData:
     def add_segment(self, seg: Segment) -> None:
         """Agrega un segmento a la lista de segmentos del mapa."""
         self.segments.append(seg)
+        self._segment_arrays = None
 
     def extend(self, segs):
         """Agrega múltiples segmentos a la lista de segmentos del mapa."""
         self.segments.extend(segs)
+        self._segment_arrays = None
+
+    @property
+    def segment_arrays(self) -> SegmentArrays:
+        """
+        Segmentos del mapa en formato SoA, construidos una vez y reutilizados entre frames.
+        Se reconstruyen si la lista de segmentos cambió de tamaño.
+        """
+        arrays = self._segment_arrays
+        if arrays is None or len(arrays) != len(self.segments):
+            arrays = self.build_segment_arrays()
+        return arrays
+
+    def build_segment_arrays(self) -> SegmentArrays:
+        """(Re)construye y guarda la vista SoA de los segmentos. La usa el cargador de mapas."""
+        self._segment_arrays = SegmentArrays.from_segments(self.segments)
+        return self._segment_arrays
 
     @property
     def bounds(self) -> tuple[float, float, float, float]:
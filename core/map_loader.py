@@ -45,12 +45,12 @@ class FileMapLoader(IMapLoader):
         player_start_angle: float = 0.0  # Ángulo inicial por defecto
 
         try:
-            with path.open("r", encoding="utf-8") as f:
-                lines = [
-                    ln.strip()
-                    for ln in f
-                    if ln.strip() and not ln.strip().startswith("#")
-                ]
+            # Lectura completa en una sola llamada; cada línea se limpia una sola vez
+            lines = [
+                ln
+                for ln in map(str.strip, path.read_text(encoding="utf-8").splitlines())
+                if ln and not ln.startswith("#")
+            ]
         except Exception as exc:  # noqa: BLE001
             raise MapLoadError(str(exc)) from exc
 
@@ -311,7 +311,10 @@ class FileMapLoader(IMapLoader):
         # --- Guardar el ángulo inicial del jugador en el MapData ---
         md.player_start_angle = player_start_angle
 
-        self._preload_textures(md.segments)
+        # Vista SoA de los segmentos: se arma una vez al cargar, no en el primer frame
+        md.build_segment_arrays()
+
+        self.preload_textures(md.segments)
 
         logger.info(
             "Mapa: %s segmentos y %s polígonos cargados.",
@@ -320,14 +323,17 @@ class FileMapLoader(IMapLoader):
         )
         return md
 
-    def _preload_textures(self, segments: List[Segment]) -> None:
+    def preload_textures(self, segments: List[Segment]) -> None:
         """
         Precarga todas las texturas únicas utilizadas en los segmentos.
+        Sube texturas a OpenGL: debe llamarse desde el hilo con el contexto activo.
         """
         if not self.texture_manager:
             return
 
         unique_textures = {seg.texture_name for seg in segments if seg.texture_name}
+        # Decodificar los PNG en paralelo; solo la subida a OpenGL queda en serie
+        self.texture_manager.prefetch(unique_textures)
         for texture_name in unique_textures:
             try:
                 self.texture_manager.get_gl_texture_id(texture_name)
@@ -15,6 +15,7 @@ class Player:
     fov_deg: float
     fov_length: float
     angle_deg: float = 0.0  # El ángulo inicial es opcional y por defecto 0.0
+    z: float = 0.0  # Altura del jugador (por ahora siempre al nivel del suelo)
 
     @property
     def pos(self) -> Vec2:
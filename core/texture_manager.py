@@ -4,6 +4,7 @@ Carga texturas desde disco y las almacena en caché.
 Utiliza PIL para manejar imágenes y OpenGL para subirlas como texturas.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from PIL import Image
 import settings
@@ -29,6 +30,8 @@ class TextureManager:
         self.texture_dir = texture_dir
         self._cache = {}
         self._gl_ids = {}
+        # Límite de anisotropía del driver: se consulta una sola vez (glGet sincroniza)
+        self._max_anisotropy = None
 
     def get_texture(self, name: str):
         """
@@ -37,13 +40,35 @@ class TextureManager:
         """
         if name in self._cache:
             return self._cache[name]
-        path = self.texture_dir / f"{name}.png"
-        if not path.exists():
-            raise FileNotFoundError(f"Textura no encontrada: {path}")
-        img = Image.open(path).convert("RGBA")
+        img = self._decode(name)
         self._cache[name] = img
         return img
 
+    def prefetch(self, names) -> None:
+        """
+        Decodifica en paralelo las texturas indicadas que aún no estén en caché.
+        No usa OpenGL: la subida a la GPU sigue ocurriendo en get_gl_texture_id.
+        """
+        pending = [n for n in dict.fromkeys(names) if n and n not in self._cache]
+        if len(pending) < 2:
+            return
+        with ThreadPoolExecutor(max_workers=min(len(pending), 4)) as pool:
+            futures = {name: pool.submit(self._decode, name) for name in pending}
+        for name, future in futures.items():
+            try:
+                self._cache[name] = future.result()
+            except FileNotFoundError:
+                pass  # get_texture volverá a fallar y quien la pida lo informará
+
+    def _decode(self, name: str):
+        """Lee y decodifica la imagen de disco (sin tocar la caché)."""
+        path = self.texture_dir / f"{name}.png"
+        # Image.open ya falla si el archivo no existe: se evita un stat() extra
+        try:
+            return Image.open(path).convert("RGBA")
+        except FileNotFoundError as e:
+            raise FileNotFoundError(f"Textura no encontrada: {path}") from e
+
     def clear_cache(self):
         """Limpia la caché de texturas."""
         self._cache.clear()
@@ -85,8 +110,11 @@ class TextureManager:
         glGenerateMipmap(GL_TEXTURE_2D)
 
         # Aplicar filtrado anisotrópico
-        max_aniso = glGetFloatv(GL_MAX_TEXTURE_MAX_ANISOTROPY_EXT)
-        glTexParameterf(GL_TEXTURE_2D, GL_TEXTURE_MAX_ANISOTROPY_EXT, max_aniso)
+        if self._max_anisotropy is None:
+            self._max_anisotropy = glGetFloatv(GL_MAX_TEXTURE_MAX_ANISOTROPY_EXT)
+        glTexParameterf(
+            GL_TEXTURE_2D, GL_TEXTURE_MAX_ANISOTROPY_EXT, self._max_anisotropy
+        )
 
         logger.debug(f"Textura subida a OpenGL con ID: {tex_id}")
         self._gl_ids[name] = tex_id
@@ -5,11 +5,13 @@ dentro del cono del FOV del jugador.
 """
 
 from __future__ import annotations
-from typing import List
+from typing import Dict, List
 import math
 
+import numpy as np
+
 from ._types import Segment, Vec2
-from .map_data import MapData
+from .map_data import MapData, SegmentArrays
 from .player import Player
 
 
@@ -20,6 +22,12 @@ class VisibilityManager:
     o si el segmento cruza el cono del FOV.
     """
 
+    # Cantidad de rayos del filtro de oclusión: RAYS_PER_SEGMENT por candidato,
+    # acotada a [MIN_RAYS, MAX_RAYS]. Con menos de 256 rayos se pierden paredes finas.
+    MIN_RAYS = 256
+    MAX_RAYS = 512
+    RAYS_PER_SEGMENT = 4
+
     @staticmethod
     def compute_visible_segments(
         map_or_bsp,
@@ -27,6 +35,8 @@ class VisibilityManager:
         max_dist: float | None = None,
         clip_to_fov: bool = None,
         see_through_portals: bool = True,  # Nuevo: permite ver a través de portales
+        ray_count: int | None = None,
+        occlusion: bool = True,
     ) -> List[Segment]:
         """
         Devuelve todos los segmentos (caras) de los polígonos principales que entren parcialmente en el FOV,
@@ -34,6 +44,9 @@ class VisibilityManager:
         El filtrado de oclusión se realiza mediante raycasting desde la posición del jugador.
 
         Si see_through_portals=True, los segmentos tipo 'portal' no bloquean la visibilidad de otros segmentos detrás.
+        Si ray_count es None, la cantidad de rayos se adapta al número de segmentos candidatos.
+        Si occlusion=False se omite el raycasting y se devuelven todos los segmentos del FOV
+        (para cuando el depth buffer de la GPU resuelve la oclusión).
         """
         # Permite recibir MapData o BSPNode
         if hasattr(map_or_bsp, "segments"):
@@ -56,178 +69,277 @@ class VisibilityManager:
         half_fov = fov_rad / 2
         max_d2 = max_dist * max_dist
 
-        visible_segments = []
-        for seg in map_data.segments:
-            if (
-                VisibilityManager._point_in_fov(seg.a, pos, ang, half_fov, max_d2)
-                or VisibilityManager._point_in_fov(seg.b, pos, ang, half_fov, max_d2)
-                or VisibilityManager._segment_crosses_fov(
-                    seg, pos, ang, half_fov, max_dist
-                )
-            ):
-                visible_segments.append(seg)
+        # Direcciones de los bordes del FOV, calculadas una sola vez por frame
+        left_dir = Vec2(math.cos(ang - half_fov), math.sin(ang - half_fov))
+        right_dir = Vec2(math.cos(ang + half_fov), math.sin(ang + half_fov))
+
+        # Prefiltro vectorizado sobre los arrays SoA del mapa
+        arrays = map_data.segment_arrays
+        in_fov = (
+            VisibilityManager._points_in_fov(
+                arrays.ax, arrays.ay, pos, left_dir, right_dir, half_fov, max_d2
+            )
+            | VisibilityManager._points_in_fov(
+                arrays.bx, arrays.by, pos, left_dir, right_dir, half_fov, max_d2
+            )
+            | VisibilityManager._segments_cross_fov(
+                arrays, pos, left_dir, right_dir, max_dist
+            )
+        )
+        candidates = np.flatnonzero(in_fov)
+        segments = map_data.segments
+
+        if not occlusion:
+            return [segments[k] for k in candidates]
+
+        if ray_count is None:
+            ray_count = min(
+                VisibilityManager.MAX_RAYS,
+                max(
+                    VisibilityManager.MIN_RAYS,
+                    VisibilityManager.RAYS_PER_SEGMENT * len(candidates),
+                ),
+            )
 
         # --- Filtrado de segmentos totalmente cubiertos usando raycasting ---
-        filtered_segments = VisibilityManager._filter_occluded_segments_raycast(
-            visible_segments, player, max_dist, see_through_portals=see_through_portals
+        visible_idx = VisibilityManager._filter_occluded_segments_raycast(
+            arrays,
+            candidates,
+            player,
+            max_dist,
+            ray_count=ray_count,
+            see_through_portals=see_through_portals,
         )
-        return filtered_segments
+        return [segments[k] for k in visible_idx]
 
     @staticmethod
     def _filter_occluded_segments_raycast(
-        segments: List[Segment],
+        arrays: SegmentArrays,
+        candidates: np.ndarray,
         player: Player,
         max_dist: float,
         ray_count: int = 256,
         see_through_portals: bool = True,  # Nuevo: permite ver a través de portales
-    ) -> List[Segment]:
+    ) -> np.ndarray:
         """
         Filtra los segmentos que están completamente cubiertos por otros usando raycasting.
         Se lanzan rayos desde la posición del jugador en el rango del FOV.
         Solo los segmentos que son impactados primero por al menos un rayo se consideran visibles.
 
+        candidates son índices en arrays (segmentos que pasaron el filtro de FOV);
+        devuelve, en el mismo orden, los índices de los que resultan visibles.
+
         Si see_through_portals=True, los segmentos tipo 'portal' no bloquean la visibilidad de otros segmentos detrás,
         pero siguen siendo visibles si están en el FOV.
         """
-        if not segments:
-            return []
-
-        pos = Vec2(player.x, player.y)
-        ang = math.radians(player.angle_deg)
-        fov_rad = math.radians(player.fov_deg)
-        half_fov = fov_rad / 2
-
-        # Mapa: segmento -> set de índices de rayos que lo impactan primero
-        segment_hits = {seg: set() for seg in segments}
-
-        # Lanzar rayos en el FOV
-        for i in range(ray_count):
-            rel = i / (ray_count - 1) if ray_count > 1 else 0.5
-            ray_angle = ang - half_fov + rel * fov_rad
-            dx = math.cos(ray_angle)
-            dy = math.sin(ray_angle)
-            ray_end = Vec2(pos.x + dx * max_dist, pos.y + dy * max_dist)
-
-            # Buscar todos los segmentos impactados por el rayo, ordenados por distancia
-            hits = []
-            for seg in segments:
-                hit = VisibilityManager._segment_ray_intersection(
-                    pos, ray_end, seg.a, seg.b
-                )
-                if hit is not None:
-                    dist = (hit.x - pos.x) ** 2 + (hit.y - pos.y) ** 2
-                    hits.append((dist, seg))
-
-            hits.sort()
-            # Marca todos los portales impactados por este rayo como visibles,
-            # y solo el primer sólido impactado (si lo hay)
-            for dist, seg in hits:
-                segment_hits[seg].add(i)
-                if getattr(seg, "wall_type", "solid") != "portal":
-                    # Si es sólido, detén el rayo aquí
-                    break
-                # Si es portal, sigue buscando detrás
+        if len(candidates) == 0:
+            return candidates
+
+        seg_hit = _raycast_kernel(
+            arrays.ax[candidates],
+            arrays.ay[candidates],
+            arrays.bx[candidates],
+            arrays.by[candidates],
+            arrays.is_portal[candidates],
+            player.x,
+            player.y,
+            math.radians(player.angle_deg),
+            math.radians(player.fov_deg),
+            max_dist,
+            ray_count,
+        )
 
         # Solo los segmentos impactados por al menos un rayo son visibles
-        visible = [seg for seg, rays in segment_hits.items() if rays]
-        return visible
+        return candidates[seg_hit]
 
     @staticmethod
-    def _segment_ray_intersection(
-        ray_a: Vec2, ray_b: Vec2, seg_a: Vec2, seg_b: Vec2
-    ) -> Vec2 | None:
+    def _points_in_fov(
+        x: np.ndarray,
+        y: np.ndarray,
+        pos: Vec2,
+        left_dir: Vec2,
+        right_dir: Vec2,
+        half_fov: float,
+        max_d2: float,
+    ) -> np.ndarray:
         """
-        Calcula la intersección entre un rayo (ray_a -> ray_b) y un segmento (seg_a, seg_b).
-        Devuelve el punto de intersección si existe y está en el rango del rayo y del segmento.
+        Determina, para cada punto (x[i], y[i]), si está dentro del cono del FOV y rango máximo.
         """
-        # Algoritmo de intersección de segmentos (paramétrico)
-        dx1 = ray_b.x - ray_a.x
-        dy1 = ray_b.y - ray_a.y
-        dx2 = seg_b.x - seg_a.x
-        dy2 = seg_b.y - seg_a.y
-
-        denom = dx1 * dy2 - dy1 * dx2
-        if abs(denom) < 1e-8:
-            return None  # Paralelos
-
-        t = ((seg_a.x - ray_a.x) * dy2 - (seg_a.y - ray_a.y) * dx2) / denom
-        u = ((seg_a.x - ray_a.x) * dy1 - (seg_a.y - ray_a.y) * dx1) / denom
-
-        if t < 0 or t > 1:
-            return None  # Intersección fuera del rayo
-        if u < 0 or u > 1:
-            return None  # Intersección fuera del segmento
+        dx = x - pos.x
+        dy = y - pos.y
+        d2 = dx * dx + dy * dy
 
-        ix = ray_a.x + t * dx1
-        iy = ray_a.y + t * dy1
-        return Vec2(ix, iy)
+        # Arco del FOV en pseudoángulos: centro y semiancho (período 4)
+        if half_fov >= math.pi:
+            return d2 <= max_d2
+        pseudo = VisibilityManager._pseudo_angle
+        left = pseudo(left_dir.x, left_dir.y)
+        span = (pseudo(right_dir.x, right_dir.y) - left) % 4.0
+        mid = left + span / 2
 
-    @staticmethod
-    def _point_in_fov(
-        p: Vec2, pos: Vec2, ang: float, half_fov: float, max_d2: float
-    ) -> bool:
-        """
-        Determina si el punto p está dentro del cono del FOV y rango máximo.
-        """
-        dx = p.x - pos.x
-        dy = p.y - pos.y
-        d2 = dx * dx + dy * dy
-        if d2 > max_d2:
-            return False
-        pa = math.atan2(dy, dx)
-        da = VisibilityManager._angle_diff(pa, ang)
-        return abs(da) <= half_fov
+        da = VisibilityManager._angle_diff(pseudo(dx, dy), mid, 4.0)
+        return (d2 <= max_d2) & (np.abs(da) <= span / 2)
 
     @staticmethod
-    def _segment_crosses_fov(
-        seg: Segment, pos: Vec2, ang: float, half_fov: float, max_dist: float
-    ) -> bool:
+    def _segments_cross_fov(
+        arrays: SegmentArrays,
+        pos: Vec2,
+        left_dir: Vec2,
+        right_dir: Vec2,
+        max_dist: float,
+    ) -> np.ndarray:
         """
-        Determina si el segmento cruza el cono del FOV.
+        Determina, para cada segmento, si cruza el cono del FOV.
         """
-        # Definir los dos bordes del FOV como rayos
-        fov_left = ang - half_fov
-        fov_right = ang + half_fov
-        left_dir = Vec2(math.cos(fov_left), math.sin(fov_left))
-        right_dir = Vec2(math.cos(fov_right), math.sin(fov_right))
+        # Extremos de los dos bordes del FOV (left_dir/right_dir son unitarios)
         left_end = Vec2(pos.x + left_dir.x * max_dist, pos.y + left_dir.y * max_dist)
         right_end = Vec2(pos.x + right_dir.x * max_dist, pos.y + right_dir.y * max_dist)
 
-        # Revisar si el segmento cruza alguno de los bordes del FOV
-        if VisibilityManager._segments_intersect(
-            pos, left_end, seg.a, seg.b
-        ) or VisibilityManager._segments_intersect(pos, right_end, seg.a, seg.b):
-            return True
+        ax, ay, bx, by = arrays.ax, arrays.ay, arrays.bx, arrays.by
+        ccw = VisibilityManager._ccw
 
-        # Revisar si el segmento cruza la base del triángulo FOV
-        base_a = left_end
-        base_b = right_end
-        if VisibilityManager._segments_intersect(base_a, base_b, seg.a, seg.b):
-            return True
+        # Lado de cada vértice del triángulo FOV respecto de cada segmento
+        pos_side = ccw(pos.x, pos.y, ax, ay, bx, by)
+        left_side = ccw(left_end.x, left_end.y, ax, ay, bx, by)
+        right_side = ccw(right_end.x, right_end.y, ax, ay, bx, by)
 
-        return False
+        def crosses(p1: Vec2, p2: Vec2, side1, side2):
+            # Los extremos del segmento quedan a distinto lado de p1-p2 y viceversa
+            return (side1 != side2) & (
+                ccw(p1.x, p1.y, p2.x, p2.y, ax, ay)
+                != ccw(p1.x, p1.y, p2.x, p2.y, bx, by)
+            )
+
+        # Bordes del FOV y base del triángulo FOV
+        return (
+            crosses(pos, left_end, pos_side, left_side)
+            | crosses(pos, right_end, pos_side, right_side)
+            | crosses(left_end, right_end, left_side, right_side)
+        )
 
     @staticmethod
-    def _angle_diff(a: float, b: float) -> float:
+    def _pseudo_angle(dx, dy):
         """
-        Calcula la diferencia angular normalizada entre dos ángulos en radianes.
+        Pseudoángulo de la dirección (dx, dy): monótono con el ángulo real, en [-1, 3)
+        y con período 4. Usa una sola división en lugar de atan2 (acepta arrays).
+        La dirección nula vale 0, como atan2(0, 0).
         """
-        d = a - b
-        while d > math.pi:
-            d -= 2 * math.pi
-        while d < -math.pi:
-            d += 2 * math.pi
-        return d
+        s = np.abs(dx) + np.abs(dy)
+        r = np.divide(dy, s, out=np.zeros_like(s), where=s > 0)
+        return np.where(dx >= 0, r, 2.0 - r)
 
     @staticmethod
-    def _segments_intersect(a1: Vec2, a2: Vec2, b1: Vec2, b2: Vec2) -> bool:
+    def _angle_diff(a: np.ndarray, b: float, period: float = 2 * math.pi) -> np.ndarray:
         """
-        Determina si los segmentos a1-a2 y b1-b2 se intersectan.
+        Calcula la diferencia angular normalizada a [-period/2, period/2] (elemento a elemento).
+        Por defecto en radianes; con period=4 sirve para pseudoángulos.
         """
+        # Resto IEEE 754 (como math.remainder) vectorizado: sin bucles ni ramas
+        d = a - b
+        return d - period * np.round(d / period)
 
-        def ccw(p1, p2, p3):
-            return (p3.y - p1.y) * (p2.x - p1.x) > (p2.y - p1.y) * (p3.x - p1.x)
+    @staticmethod
+    def _ccw(x1, y1, x2, y2, x3, y3):
+        """
+        True si los puntos 1, 2, 3 giran en sentido antihorario (acepta arrays).
+        """
+        return (y3 - y1) * (x2 - x1) > (y2 - y1) * (x3 - x1)
+
+
+def _raycast_kernel(
+    seg_ax: np.ndarray,
+    seg_ay: np.ndarray,
+    seg_bx: np.ndarray,
+    seg_by: np.ndarray,
+    seg_is_portal: np.ndarray,
+    px: float,
+    py: float,
+    ang: float,
+    fov_rad: float,
+    max_dist: float,
+    ray_count: int,
+) -> np.ndarray:
+    """
+    Núcleo del filtrado por raycasting, vectorizado con NumPy sobre la matriz
+    rayos x segmentos. Devuelve una máscara por segmento: True si algún rayo lo
+    impacta antes que cualquier sólido. Los portales no detienen el rayo.
 
-        return (ccw(a1, b1, b2) != ccw(a2, b1, b2)) and (
-            ccw(a1, a2, b1) != ccw(a1, a2, b2)
-        )
+    Los rayos van de (px, py) a (px, py) + max_dist * (cos, sin), por lo que el
+    parámetro t del rayo es proporcional a la distancia y basta para comparar.
+    """
+    # Matriz (rayos, segmentos): los rayos van en filas y los segmentos en columnas
+    seg_dx = seg_bx - seg_ax
+    seg_dy = seg_by - seg_ay
+    seg_qx = seg_ax - px
+    seg_qy = seg_ay - py
+    n = len(seg_ax)
+
+    ray_dirs = _ray_directions(ang, fov_rad, max_dist, ray_count)
+
+    # Intersección paramétrica rayo/segmento para todos los pares a la vez.
+    # denom y el numerador de u son productos (rdx, rdy) · (col): se obtienen
+    # con una sola multiplicación de matrices (R, 2) @ (2, 2S) en vez de
+    # varias pasadas de broadcasting sobre la matriz completa.
+    cols = np.empty((2, 2 * n), dtype=seg_dx.dtype)
+    cols[0, :n] = seg_dy
+    cols[1, :n] = -seg_dx
+    cols[0, n:] = -seg_qy
+    cols[1, n:] = seg_qx
+    prods = ray_dirs @ cols
+    denom = prods[:, :n]
+    u_num = prods[:, n:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = (seg_qx * seg_dy - seg_qy * seg_dx) / denom
+        u = u_num / denom
+    # La máscara se acumula en el lugar (&=) para no crear una matriz por condición
+    hit = np.abs(denom) >= 1e-8  # No paralelos
+    hit &= t >= 0
+    hit &= t <= 1  # Dentro del rayo
+    hit &= u >= 0
+    hit &= u <= 1  # Dentro del segmento
+
+    # Un solo paso sin ordenar: el sólido más cercano de cada rayo (sin sólido, t = inf)
+    solid_t = np.where(hit & ~seg_is_portal, t, np.inf)
+    first = solid_t.argmin(axis=1)
+    first_t = solid_t[np.arange(ray_count), first]
+
+    # Visibles: los portales impactados antes de ese sólido, y el propio sólido.
+    # Solo se recorren las columnas de portales, que suelen ser pocas.
+    visible = np.zeros(n, dtype=bool)
+    visible[seg_is_portal] = (
+        hit[:, seg_is_portal] & (t[:, seg_is_portal] < first_t[:, None])
+    ).any(axis=0)
+    visible[first[first_t < np.inf]] = True
+    return visible
+
+
+# Direcciones de los rayos del último frame; se reutilizan mientras la vista no cambie
+_ray_dir_cache: Dict[tuple, np.ndarray] = {}
+
+
+def _ray_directions(
+    ang: float, fov_rad: float, max_dist: float, ray_count: int
+) -> np.ndarray:
+    """
+    Devuelve una matriz (ray_count, 2) con el vector (rdx, rdy) de cada rayo,
+    escalado a max_dist y repartido uniformemente en el FOV.
+    """
+    key = (ang, fov_rad, max_dist, ray_count)
+    cached = _ray_dir_cache.get(key)
+    if cached is not None:
+        return cached
+
+    half_fov = fov_rad / 2
+    if ray_count > 1:
+        rel = np.linspace(0.0, 1.0, ray_count)
+    else:
+        rel = np.full(ray_count, 0.5)
+    ray_angle = ang - half_fov + rel * fov_rad
+    ray_dirs = np.empty((ray_count, 2), dtype=np.float32)
+    ray_dirs[:, 0] = np.cos(ray_angle) * max_dist
+    ray_dirs[:, 1] = np.sin(ray_angle) * max_dist
+    ray_dirs.flags.writeable = False
+
+    _ray_dir_cache.clear()
+    _ray_dir_cache[key] = ray_dirs
+    return ray_dirs
@@ -17,10 +17,14 @@ from __future__ import annotations
 import sys
 import platform
 import logging
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from string import Template
 
 import settings
 from utils.logging_setup import configure_logging
 from core.map_loader import FileMapLoader
+from core.map_data import MapData
 from core.bsp import BSPBuilder
 from core.player import Player
 from core.game import Game
@@ -31,6 +35,36 @@ from render.glfw_render import GLFW_OpenGLRenderer
 
 logger = logging.getLogger(__name__)
 
+# Banner de arranque; solo las versiones y la plataforma se completan en runtime
+_BANNER = Template(
+    """
+        ==================================================
+        Xoom - A Doom like game engine
+        Author: Xardax
+        Date relace: 2025-06-19
+        Version: 0.1.0
+        License: MIT
+        ==================================================
+        Python: $python
+        GLFW: $glfw
+        OpenGL: $opengl
+        ==================================================
+        Platform: $system $release ($machine)
+        Processor: $processor
+        ==================================================
+        """
+)
+
+
+# Invariantes del proceso
+_PYTHON_VERSION = sys.version.split()[0]
+
+
+@functools.lru_cache(maxsize=1)
+def _system_info() -> platform.uname_result:
+    """Consulta la plataforma una sola vez (uname puede ser lento en algunos sistemas)."""
+    return platform.uname()
+
 
 class GameRunner:
     """
@@ -48,33 +82,43 @@ class GameRunner:
         """
         Inicializa el renderizador OpenGL con GLFW.
         """
+        width, height = settings.WINDOW_WIDTH, settings.WINDOW_HEIGHT
+        theme, scale = settings.COLOR_THEME, settings.MINIMAP_SCALE
+
         logger.info("Inicializando renderer y creando la ventana...")
         self.renderer = GLFW_OpenGLRenderer(
-            width=settings.WINDOW_WIDTH,
-            height=settings.WINDOW_HEIGHT,
+            width=width,
+            height=height,
             caption="Xoom Engine",
-            color_theme=settings.COLOR_THEME,
-            scale=settings.MINIMAP_SCALE,
+            color_theme=theme,
+            scale=scale,
         )
         # logger.info("Renderer inicializado con éxito.")
 
-    def _load_map(self) -> None:
+    @staticmethod
+    def _load_map() -> MapData:
         """
         Carga los datos del mapa desde el archivo especificado en la configuración.
+        No toca OpenGL, así que puede ejecutarse en un hilo mientras se crea la ventana.
         """
         # logger.info("Cargando datos del mapa...")
+        return FileMapLoader().load(settings.DEFAULT_MAP_FILE)
+
+    def _preload_textures(self) -> None:
+        """
+        Sube a OpenGL las texturas del mapa ya cargado (requiere el renderer).
+        """
         loader = FileMapLoader(texture_manager=self.renderer.texture_manager)
-        self.map_data = loader.load(settings.DEFAULT_MAP_FILE)
-        # logger.info("Mapa cargado: %s segmentos", len(self.map_data.segments))
+        loader.preload_textures(self.map_data.segments)
 
     def _build_bsp_tree(self) -> None:
         """
         Construye el árbol BSP a partir de los datos del mapa cargados.
         """
+        max_depth, strategy = settings.BSP_MAX_DEPTH, settings.BSP_SPLIT_STRATEGY
+
         # logger.info("Construyendo árbol BSP...")
-        bsp_builder = BSPBuilder(
-            max_depth=settings.BSP_MAX_DEPTH, strategy=settings.BSP_SPLIT_STRATEGY
-        )
+        bsp_builder = BSPBuilder(max_depth=max_depth, strategy=strategy)
         self.bsp_root = bsp_builder.build(self.map_data.segments)
         # logger.info("BSP construido con éxito.")
 
@@ -82,12 +126,19 @@ class GameRunner:
         """
         Inicializa al jugador con la posición inicial del mapa y la configuración.
         """
+        start = self.map_data.player_start
+        angle_deg, fov_deg, fov_length = (
+            settings.PLAYER_START_ANGLE_DEG,
+            settings.PLAYER_FOV_DEG,
+            settings.PLAYER_FOV_LENGTH,
+        )
+
         self.player = Player(
-            x=self.map_data.player_start.x,
-            y=self.map_data.player_start.y,
-            angle_deg=settings.PLAYER_START_ANGLE_DEG,
-            fov_deg=settings.PLAYER_FOV_DEG,
-            fov_length=settings.PLAYER_FOV_LENGTH,
+            x=start.x,
+            y=start.y,
+            angle_deg=angle_deg,
+            fov_deg=fov_deg,
+            fov_length=fov_length,
         )
         logger.info("Jugador inicializado en la posición: %s", self.player.pos)
 
@@ -106,25 +157,18 @@ class GameRunner:
         """
         Muestra información del sistema y versiones de las bibliotecas utilizadas.
         """
-        uname = platform.uname()
+        uname = _system_info()
 
         logger.info(
-            f"""
-        ==================================================
-        Xoom - A Doom like game engine
-        Author: Xardax
-        Date relace: 2025-06-19
-        Version: 0.1.0
-        License: MIT
-        ==================================================
-        Python: {sys.version.split()[0]}
-        GLFW: {GLFW_OpenGLRenderer.get_GLFW_version()}
-        OpenGL: {self.renderer.get_opengl_version()}
-        ==================================================
-        Platform: {platform.system()} {platform.release()} ({platform.machine()})
-        Processor: {uname.processor}
-        ==================================================
-        """
+            _BANNER.substitute(
+                python=_PYTHON_VERSION,
+                glfw=GLFW_OpenGLRenderer.get_GLFW_version(),
+                opengl=self.renderer.get_opengl_version(),
+                system=uname.system,
+                release=uname.release,
+                machine=uname.machine,
+                processor=uname.processor,
+            )
         )
 
     def run(self) -> None:
@@ -135,18 +179,25 @@ class GameRunner:
             # Configurar el logging
             configure_logging()
 
-            self._initialize_renderer()
-            self._log_system_info()
+            # El mapa se parsea en segundo plano mientras se crean la ventana
+            # y el contexto GL (que deben quedarse en el hilo principal)
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                map_future = pool.submit(self._load_map)
+
+                self._initialize_renderer()
+                self._log_system_info()
+
+                # Mostrar menú principal
+                menu = MainMenu(self.renderer)
+                opcion = menu.show()
+                if opcion != "Play":
+                    logger.info("Saliendo por menú.")
+                    self.renderer.shutdown()
+                    return
 
-            # Mostrar menú principal
-            menu = MainMenu(self.renderer)
-            opcion = menu.show()
-            if opcion != "Play":
-                logger.info("Saliendo por menú.")
-                self.renderer.shutdown()
-                return
+                self.map_data = map_future.result()
 
-            self._load_map()
+            self._preload_textures()
             self._build_bsp_tree()
             self._initialize_player()
             self._create_game_instance()
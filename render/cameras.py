@@ -7,22 +7,29 @@ MainCamera: Cámara principal para la vista 3D, desacoplada del jugador.
 """
 
 from __future__ import annotations
-from dataclasses import dataclass
-
-# Importamos las funciones de OpenGL que necesitaremos para la transformación
-from OpenGL.GL import (
-    glLoadIdentity,
-    glMatrixMode,
-    glScalef,
-    glTranslatef,
-    glOrtho,
-    GL_MODELVIEW,
-    GL_PROJECTION,
-)
+from dataclasses import dataclass, field
+import math
+
+import numpy as np
+
 from core._types import Vec2  # Importar Vec2 para la propiedad pos
 
+# Módulo OpenGL.GL; se importa en la primera transformación para que importar
+# las cámaras (herramientas, scripts) no cargue PyOpenGL
+_GL = None
+
+
+def _gl():
+    """Devuelve OpenGL.GL, importándolo la primera vez que se necesita."""
+    global _GL
+    if _GL is None:
+        from OpenGL import GL
 
-@dataclass
+        _GL = GL
+    return _GL
+
+
+@dataclass(slots=True)
 class Camera2D:
     """
     Gestiona la vista 2D y aplica las transformaciones
@@ -34,6 +41,16 @@ class Camera2D:
     scale: float = 1.0
     x: float = 0.0
     y: float = 0.0
+    # Matriz MODELVIEW en orden de columnas y los parámetros con que se calculó
+    _matrix: np.ndarray = field(
+        default_factory=lambda: np.identity(4, dtype=np.float32),
+        init=False,
+        repr=False,
+        compare=False,
+    )
+    _matrix_key: tuple | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def set_target(self, target_x: float, target_y: float) -> None:
         """Actualiza la posición de la cámara para centrarse en un punto."""
@@ -45,14 +62,26 @@ class Camera2D:
         Aplica las transformaciones de la cámara a la matriz MODELVIEW de OpenGL.
         Esto debe llamarse una vez por frame, antes de dibujar cualquier objeto del mundo.
         """
-        glMatrixMode(GL_MODELVIEW)
-        glLoadIdentity()
-
-        glTranslatef(self.width / 2.0, self.height / 2.0, 0)
+        gl = _gl()
+        gl.glMatrixMode(gl.GL_MODELVIEW)
+        gl.glLoadMatrixf(self._get_matrix())
 
-        glScalef(self.scale, self.scale, 1.0)
-
-        glTranslatef(-self.x, -self.y, 0)
+    def _get_matrix(self) -> np.ndarray:
+        """
+        Devuelve la matriz traslación(centro) * escala * traslación(-objetivo),
+        recalculada solo si cambió el tamaño, la escala o el objetivo.
+        """
+        key = (self.width, self.height, self.scale, self.x, self.y)
+        if key != self._matrix_key:
+            m = self._matrix
+            s = self.scale
+            m[0, 0] = s
+            m[1, 1] = s
+            # Traslación en la última columna (fila 3 al estar en orden de columnas)
+            m[3, 0] = self.width / 2.0 - s * self.x
+            m[3, 1] = self.height / 2.0 - s * self.y
+            self._matrix_key = key
+        return self._matrix
 
     def update_viewport(self, width: int, height: int) -> None:
         """Actualiza las dimensiones de la cámara, útil al redimensionar la ventana."""
@@ -60,7 +89,7 @@ class Camera2D:
         self.height = height
 
 
-@dataclass
+@dataclass(slots=True)
 class MainCamera:
     """
     Cámara principal para la vista 3D.
@@ -72,6 +101,14 @@ class MainCamera:
     z: float = 0.0
     angle_deg: float = 0.0
     fov_deg: float = 90.0  # FOV horizontal de la cámara, sincronizado con el jugador
+    # Matriz de vista en orden de columnas y los parámetros con que se calculó
+    _view: np.ndarray = field(
+        default_factory=lambda: np.identity(4, dtype=np.float32),
+        init=False,
+        repr=False,
+        compare=False,
+    )
+    _view_key: tuple | None = field(default=None, init=False, repr=False, compare=False)
 
     @property
     def pos(self) -> Vec2:
@@ -101,16 +138,37 @@ class MainCamera:
         Esto asegura que la proyección y la lógica de visibilidad sean consistentes.
         """
         self.x = player.x
-        self.y = getattr(player, "z", 0.0)  # Si el jugador tiene altura z
+        self.y = player.z
         self.z = player.y
         self.angle_deg = player.angle_deg
         # Sincronizar el FOV de la cámara con el del jugador
-        self.fov_deg = getattr(player, "fov_deg", 90.0)
+        self.fov_deg = player.fov_deg
+
+    def view_matrix(self, eye_height: float) -> np.ndarray:
+        """
+        Devuelve la matriz MODELVIEW rotación(angle_deg + 90, eje Y) * traslación(-x, -eye_height, -z),
+        en orden de columnas para glLoadMatrixf. Se recalcula solo si la cámara se movió.
+        """
+        key = (self.x, self.z, self.angle_deg, eye_height)
+        if key != self._view_key:
+            a = math.radians(self.angle_deg + 90.0)
+            c = math.cos(a)
+            s = math.sin(a)
+            m = self._view
+            m[0, 0] = c
+            m[0, 2] = -s
+            m[2, 0] = s
+            m[2, 2] = c
+            m[3, 0] = -c * self.x - s * self.z
+            m[3, 1] = -eye_height
+            m[3, 2] = s * self.x - c * self.z
+            self._view_key = key
+        return self._view
 
     # Métodos adicionales para interpolación, efectos, etc. pueden añadirse aquí.
 
 
-@dataclass
+@dataclass(slots=True)
 class HUDCamera:
     """
     HUDCamera: Cámara 2D para renderizar el HUD (información en pantalla).
@@ -120,16 +178,31 @@ class HUDCamera:
 
     width: int
     height: int
+    # Matriz ortográfica (orden de columnas); se recalcula al cambiar el viewport
+    _projection: np.ndarray | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def apply_transform(self) -> None:
         """
         Aplica la transformación ortográfica para el HUD.
+        Equivale a glOrtho(0, width, 0, height, -1, 1) con la matriz precalculada.
         """
-        glMatrixMode(GL_PROJECTION)
-        glLoadIdentity()
-        glOrtho(0, self.width, 0, self.height, -1, 1)
-        glMatrixMode(GL_MODELVIEW)
-        glLoadIdentity()
+        if self._projection is None:
+            self._projection = np.array(
+                [
+                    [2.0 / self.width, 0.0, 0.0, 0.0],
+                    [0.0, 2.0 / self.height, 0.0, 0.0],
+                    [0.0, 0.0, -1.0, 0.0],
+                    [-1.0, -1.0, 0.0, 1.0],
+                ],
+                dtype=np.float32,
+            )
+        gl = _gl()
+        gl.glMatrixMode(gl.GL_PROJECTION)
+        gl.glLoadMatrixf(self._projection)
+        gl.glMatrixMode(gl.GL_MODELVIEW)
+        gl.glLoadIdentity()
 
     def update_viewport(self, width: int, height: int) -> None:
         """
@@ -137,3 +210,4 @@ class HUDCamera:
         """
         self.width = width
         self.height = height
+        self._projection = None
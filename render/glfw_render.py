@@ -5,8 +5,15 @@ Esta clase gestiona la ventana, el contexto OpenGL y el renderizado del mundo 3D
 
 from __future__ import annotations
 import logging
+import hashlib
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Dict, Any, Iterable, Optional
 
+import numpy as np
+
 import glfw
 from OpenGL.GL import *
 from OpenGL.GL import shaders
@@ -37,9 +44,13 @@ _KEYMAP = {
     glfw.KEY_E: ("strafe", settings.PLAYER_SPEED / 2),
 }
 
+# _KEYMAP aplanado para poll_input: (tecla, eje, valor)
+_AXIS_KEYS = tuple((key, action, value) for key, (action, value) in _KEYMAP.items())
+
 
-def load_shader_source(path):
-    with open(path, "r", encoding="utf-8") as f:
+def load_shader_source(path) -> bytes:
+    # GLSL se pasa tal cual al driver: se lee en bytes, sin decodificar a str
+    with open(path, "rb") as f:
         return f.read()
 
 
@@ -56,20 +67,35 @@ class GLFW_OpenGLRenderer(IRenderer):
         """
         return glfw.get_version_string().decode()
 
-    def _compile_shader_program(self, vert_path: str, frag_path: str) -> int:
-        """Compila un par de shaders y devuelve el ID del programa."""
+    def _compile_shader_program(
+        self, vert_path: str, frag_path: str, sources: Optional[tuple] = None
+    ) -> int:
+        """
+        Compila un par de shaders y devuelve el ID del programa.
+        sources permite pasar el código (vertex, fragment) ya leído; si no, se lee
+        de vert_path y frag_path.
+        Si hay un binario del programa en la caché de disco se usa ese y se evita
+        compilar el GLSL; tras compilar desde fuente se guarda el binario.
+        """
         try:
-            vertex_src = load_shader_source(vert_path)
-            fragment_src = load_shader_source(frag_path)
+            if sources is None:
+                sources = load_shader_source(vert_path), load_shader_source(frag_path)
+            vertex_src, fragment_src = sources
             if not vertex_src or not fragment_src:
                 raise RuntimeError(
                     f"No se pudieron cargar los shaders: {vert_path}, {frag_path}"
                 )
 
+            cache_path = self._shader_cache_path(vertex_src, fragment_src)
+            program = self._load_program_binary(cache_path)
+            if program is not None:
+                return program
+
             program = shaders.compileProgram(
                 shaders.compileShader(vertex_src, GL_VERTEX_SHADER),
                 shaders.compileShader(fragment_src, GL_FRAGMENT_SHADER),
             )
+            self._store_program_binary(program, cache_path)
             return program
         except Exception as e:
             logger.error(
@@ -77,6 +103,76 @@ class GLFW_OpenGLRenderer(IRenderer):
             )
             raise RuntimeError("Fallo al compilar los shaders OpenGL") from e
 
+    @staticmethod
+    def _shader_cache_path(vertex_src: bytes, fragment_src: bytes) -> Path:
+        """
+        Ruta del binario en caché: depende del código de ambos shaders y del driver
+        (un binario solo es válido para el mismo renderer y versión de OpenGL).
+        """
+        digest = hashlib.sha1()
+        for part in (
+            glGetString(GL_RENDERER) or b"",
+            glGetString(GL_VERSION) or b"",
+            vertex_src,
+            b"\0",
+            fragment_src,
+        ):
+            digest.update(part)
+        return Path(settings.SHADER_CACHE_DIR) / f"{digest.hexdigest()}.bin"
+
+    @staticmethod
+    def _load_program_binary(path: Path) -> Optional[int]:
+        """
+        Crea un programa a partir de un binario guardado (formato uint32 + datos).
+        Devuelve None si no existe, si el driver no soporta binarios o lo rechaza.
+        """
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        if len(data) <= 4:
+            return None
+
+        program = None
+        try:
+            (binary_format,) = struct.unpack_from("<I", data)
+            binary = np.frombuffer(data, dtype=np.uint8, offset=4)
+            program = glCreateProgram()
+            glProgramBinary(program, binary_format, binary, len(binary))
+            if glGetProgramiv(program, GL_LINK_STATUS) == GL_TRUE:
+                logger.debug("Programa de shaders cargado desde caché: %s", path.name)
+                return program
+        except Exception as e:  # noqa: BLE001 - sin soporte de binarios (GL < 4.1)
+            logger.debug("No se pudo usar el binario de shaders %s: %s", path, e)
+        if program:
+            glDeleteProgram(program)
+        return None
+
+    @staticmethod
+    def _store_program_binary(program: int, path: Path) -> None:
+        """
+        Guarda el binario del programa ya enlazado. La escritura es atómica (archivo
+        temporal + replace) y cualquier fallo solo se registra: la caché es opcional.
+        """
+        try:
+            length = int(glGetProgramiv(program, GL_PROGRAM_BINARY_LENGTH))
+            if length <= 0:
+                return
+            binary = np.empty(length, dtype=np.uint8)
+            written = GLsizei(0)
+            binary_format = GLenum(0)
+            glGetProgramBinary(program, length, written, binary_format, binary)
+
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(
+                struct.pack("<I", binary_format.value)
+                + binary[: written.value].tobytes()
+            )
+            os.replace(tmp, path)
+        except Exception as e:  # noqa: BLE001
+            logger.debug("No se pudo guardar el binario de shaders %s: %s", path, e)
+
     def _init_shaders(self):
         """
         Inicializa todos los programas de shaders necesarios de forma eficiente y extensible.
@@ -122,11 +218,27 @@ class GLFW_OpenGLRenderer(IRenderer):
             ),
         ]
 
-        for attr, vert, frag, desc in shader_defs:
+        # Los archivos se leen en paralelo; la compilación (llamadas GL) sigue en
+        # este hilo, que es el que tiene el contexto activo
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            pending = [
+                (
+                    pool.submit(load_shader_source, vert),
+                    pool.submit(load_shader_source, frag),
+                )
+                for _, vert, frag, _ in shader_defs
+            ]
+
+        for (attr, vert, frag, desc), (vertex_src, fragment_src) in zip(
+            shader_defs, pending
+        ):
             try:
                 logger.info(f"Compilando shaders de {desc}...")
-                program = self._compile_shader_program(vert, frag)
+                program = self._compile_shader_program(
+                    vert, frag, (vertex_src.result(), fragment_src.result())
+                )
                 setattr(self, attr, program)
+                self._programs.append(program)
             except Exception as e:
                 logger.error(f"Error al compilar shaders de {desc}: {e}")
                 setattr(self, attr, None)
@@ -152,6 +264,8 @@ class GLFW_OpenGLRenderer(IRenderer):
         self.floor_shader_program = None
         self.ceiling_shader_program = None
         self.ui_shader_program = None
+        # Programas compilados con éxito, para liberarlos en shutdown
+        self._programs: list[int] = []
 
         self.width = width
         self.height = height
@@ -174,11 +288,52 @@ class GLFW_OpenGLRenderer(IRenderer):
         except Exception as e:
             self.gl_version = "Unknown"
 
+        # glInvalidateFramebuffer (OpenGL 4.3) permite descartar el depth al terminar
+        # el frame: en GPUs por tiles evita escribirlo a memoria antes del swap
+        context_version = (
+            glfw.get_window_attrib(self.window, glfw.CONTEXT_VERSION_MAJOR),
+            glfw.get_window_attrib(self.window, glfw.CONTEXT_VERSION_MINOR),
+        )
+        self._can_invalidate = context_version >= (4, 3)
+        self._discard_attachments = (GLenum * 1)(GL_DEPTH)
+
+        self._viewport_dirty = False
         glfw.set_window_size_callback(self.window, self._on_resize)
+        # Estado del teclado actualizado por callback: poll_input no consulta tecla por tecla
+        self._keys_down: set[int] = set()
+        # Diccionario devuelto por poll_input: se reescribe cada frame en lugar de
+        # crear uno nuevo (los llamadores no deben conservarlo entre frames)
+        self._input_state: Dict[str, Any] = {
+            "turn": 0.0,
+            "move": 0.0,
+            "strafe": 0.0,
+            "quit": False,
+            "up": False,
+            "down": False,
+            "select": False,
+        }
+        glfw.set_key_callback(self.window, self._on_key)
         self.world_renderer = WorldRenderer(self)
         self.camera = Camera2D(width=width, height=height, scale=scale)
         self.main_camera = MainCamera()
         self.hud_camera = HUDCamera(width=width, height=height)
+        self.ui_renderer = UIRenderer(self)
+        # Etiqueta HUD reutilizada entre frames: su texto (y su textura) solo cambia
+        # cuando cambia la posición redondeada del jugador
+        self._hud_label = UILabel(
+            text="",
+            x=12,  # self.width - 420,
+            y=12,
+            color=(255, 255, 255, 255),
+            bg_color=(0, 0, 0, 180),
+            font_size=16,
+        )
+        self._hud_last = None
+        # True mientras se muestra el menú: dispatch_events espera eventos en lugar
+        # de sondear, ya que nada se anima entre pulsaciones
+        self._wait_events = False
+        # Último color de limpieza enviado a OpenGL (ver set_clear_color)
+        self._clear_color = None
         self._setup_gl(width, height)
 
         self.point_light = PointLight(
@@ -196,58 +351,72 @@ class GLFW_OpenGLRenderer(IRenderer):
         return self.gl_version
 
     def _setup_gl(self, width: int, height: int) -> None:
-        """Configura el estado inicial de OpenGL para renderizado 2D."""
+        """
+        Configura el estado inicial de OpenGL. Las matrices no se cargan aquí: cada
+        pasada usa las suyas (uniforms en los shaders, cámaras en el minimapa).
+        """
         bg = self.theme["bg"]
-        glClearColor(bg[0] / 255.0, bg[1] / 255.0, bg[2] / 255.0, 1.0)
+        self.set_clear_color((bg[0] / 255.0, bg[1] / 255.0, bg[2] / 255.0, 1.0))
 
-        glMatrixMode(GL_PROJECTION)
-        glLoadIdentity()
-        glOrtho(0, width, 0, height, -1, 1)
-        glMatrixMode(GL_MODELVIEW)
-        glLoadIdentity()
+    def set_clear_color(self, rgba: tuple) -> None:
+        """Cambia el color de limpieza solo si difiere del último enviado."""
+        if rgba != self._clear_color:
+            glClearColor(*rgba)
+            self._clear_color = rgba
 
     def _on_resize(self, window, width: int, height: int) -> None:
-        """Callback para el redimensionamiento de la ventana."""
+        """
+        Callback para el redimensionamiento de la ventana. Solo registra el tamaño:
+        el viewport y las cámaras se actualizan en _apply_viewport, una vez por
+        frame aunque lleguen varios eventos seguidos.
+        """
         self.width = width
         self.height = height
-        glViewport(0, 0, width, height)
-        self.camera.update_viewport(width, height)
-        self.hud_camera.update_viewport(width, height)
+        self._viewport_dirty = True
+
+    def _apply_viewport(self) -> None:
+        """Aplica el último tamaño de ventana recibido, si cambió."""
+        if not self._viewport_dirty:
+            return
+        glViewport(0, 0, self.width, self.height)
+        self.camera.update_viewport(self.width, self.height)
+        self.hud_camera.update_viewport(self.width, self.height)
+        self._viewport_dirty = False
 
     # --- Implementación de la interfaz IRenderer ---
 
     def is_running(self) -> bool:
         return not glfw.window_should_close(self.window)
 
+    def _on_key(self, window, key: int, scancode: int, action: int, mods: int) -> None:
+        """
+        Callback de teclado de GLFW (se ejecuta dentro de poll_events): mantiene el
+        conjunto de teclas presionadas que lee poll_input.
+        """
+        if action == glfw.RELEASE:
+            self._keys_down.discard(key)
+        else:
+            self._keys_down.add(key)
+
     def poll_input(self) -> Dict[str, Any]:
-        state = {
-            "turn": 0.0,
-            "move": 0.0,
-            "strafe": 0.0,
-            "quit": False,
-            "up": False,
-            "down": False,
-            "select": False,
-        }
-        if glfw.get_key(self.window, glfw.KEY_ESCAPE) == glfw.PRESS:
-            state["quit"] = True
+        down = self._keys_down
+        state = self._input_state
+        if glfw.KEY_ESCAPE in down:
             glfw.set_window_should_close(self.window, True)
+            state["turn"] = state["move"] = state["strafe"] = 0.0
+            state["quit"] = True
+            state["up"] = state["down"] = state["select"] = False
             return state
-        if glfw.get_key(self.window, glfw.KEY_DOWN) == glfw.PRESS:
-            state["down"] = True
-        if glfw.get_key(self.window, glfw.KEY_UP) == glfw.PRESS:
-            state["up"] = True
-        if (
-            glfw.get_key(self.window, glfw.KEY_ENTER) == glfw.PRESS
-            or glfw.get_key(self.window, glfw.KEY_KP_ENTER) == glfw.PRESS
-        ):
-            state["select"] = True
 
-        for key, (action, value) in _KEYMAP.items():
-            if glfw.get_key(self.window, key) == glfw.PRESS:
-                if action in ("turn", "move", "strafe"):
-                    state[action] += value
+        state["turn"] = state["move"] = state["strafe"] = 0.0
+        for key, axis, value in _AXIS_KEYS:
+            if key in down:
+                state[axis] += value
 
+        state["quit"] = False
+        state["up"] = glfw.KEY_UP in down
+        state["down"] = glfw.KEY_DOWN in down
+        state["select"] = glfw.KEY_ENTER in down or glfw.KEY_KP_ENTER in down
         return state
 
     def draw_frame(
@@ -260,7 +429,9 @@ class GLFW_OpenGLRenderer(IRenderer):
         Orquesta el dibujado del mapa en 3D y del overlay del minimapa 2D.
         Actualiza la posición de la luz puntual para que siga al jugador antes de renderizar.
         """
-        glClearColor(0.0, 0.0, 0.0, 1.0)
+        self._wait_events = False
+        self._apply_viewport()
+        self.set_clear_color((0.0, 0.0, 0.0, 1.0))
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
 
         # --- Actualizar la posición de la luz puntual para que siga al jugador ---
@@ -269,54 +440,66 @@ class GLFW_OpenGLRenderer(IRenderer):
         # --- Sincronizar la cámara principal con el jugador ---
         self.main_camera.follow_player(player)
 
-        if (
-            visible_segments is None
-            and hasattr(map_data, "bsp_root")
-            and map_data.bsp_root
-        ):
-            visible_segments = VisibilityManager.compute_visible_segments(
-                map_data.bsp_root, player
-            )
+        if visible_segments is None:
+            bsp_root = getattr(map_data, "bsp_root", None)
+            if bsp_root:
+                visible_segments = VisibilityManager.compute_visible_segments(
+                    bsp_root, player
+                )
+        # El mundo 3D y el minimapa recorren la misma colección: un generador se
+        # agotaría en la primera pasada, así que se materializa una sola vez
+        if visible_segments is None:
+            visible_segments = []
+        elif not isinstance(visible_segments, list):
+            visible_segments = list(visible_segments)
 
         # --- Renderizado del mundo y minimapa ---
         self.world_renderer.draw_3d_world(self.main_camera, visible_segments, map_data)
         self.world_renderer.draw_2d_minimap(map_data, player, visible_segments)
 
-        # --- HUD: Mostrar la posición del jugador usando HUDCamera y UILabel ---
-        self.hud_camera.apply_transform()
-        if not hasattr(self, "ui_renderer"):
-            self.ui_renderer = UIRenderer(self)
-        # Crear etiqueta HUD y dibujarla
-
-        label = UILabel(
-            text=f"Pos: x={player.x:.1f} y={player.y:.1f} z={getattr(player, 'z', 0.0):.1f}",
-            x=12,  # self.width - 420,
-            y=12,
-            color=(255, 255, 255, 255),
-            bg_color=(0, 0, 0, 180),
-            font_size=16,
+        # --- HUD: Mostrar la posición del jugador con UILabel ---
+        # El shader de etiquetas recibe su proyección como uniform (cacheada en
+        # UIRenderer), así que no hace falta cargar la pila de matrices del HUD
+        label = self._hud_label
+        key = (
+            f"{player.x:.1f}",
+            f"{player.y:.1f}",
+            f"{player.z:.1f}",
         )
+        if key != self._hud_last:
+            # Liberar la textura del texto anterior antes de generar la nueva
+            label.cleanup()
+            label.text = f"Pos: x={key[0]} y={key[1]} z={key[2]}"
+            self._hud_last = key
         self.ui_renderer.draw_label(label, self.width, self.height)
 
     def dispatch_events(self) -> None:
-        glfw.poll_events()
+        """
+        Procesa los eventos de la ventana. En el menú bloquea hasta que llegue un
+        evento (o ~1/30 s) para no consumir CPU; un elemento animado del menú
+        necesitaría despertar el bucle con glfw.post_empty_event().
+        """
+        if self._wait_events:
+            glfw.wait_events_timeout(1 / 30)
+        else:
+            glfw.poll_events()
 
     def flip_buffers(self) -> None:
+        if self._can_invalidate:
+            # El depth no se lee después del frame; el color sí (se presenta)
+            glInvalidateFramebuffer(GL_FRAMEBUFFER, 1, self._discard_attachments)
         glfw.swap_buffers(self.window)
 
     def shutdown(self) -> None:
         logger.info("Cerrando GLFW.")
-        if self.shader_program:
-            glDeleteProgram(self.shader_program)
-        if self.floor_shader_program:
-            glDeleteProgram(self.floor_shader_program)
-        if self.ceiling_shader_program:
-            glDeleteProgram(self.ceiling_shader_program)
-        if self.ui_shader_program:
-            glDeleteProgram(self.ui_shader_program)
-
-        if hasattr(self, "ui_renderer"):
-            self.ui_renderer.cleanup()
+        # Todos los programas compilados en _init_shaders (incluidos los de UI)
+        for program in self._programs:
+            glDeleteProgram(program)
+        self._programs.clear()
+
+        self.world_renderer.cleanup()
+        self._hud_label.cleanup()
+        self.ui_renderer.cleanup()
 
         glfw.terminate()
 
@@ -324,8 +507,8 @@ class GLFW_OpenGLRenderer(IRenderer):
         """
         Dibuja el menú principal usando UIRenderer.
         """
-        if not hasattr(self, "ui_renderer"):
-            self.ui_renderer = UIRenderer(self)
+        self._wait_events = True
+        self._apply_viewport()
         self.ui_renderer.draw_main_menu(options, selected_index)
 
     def get_minimap_shader_program(self):
@@ -19,6 +19,20 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+def _is_bound(shader_program) -> bool:
+    """
+    Comprueba que shader_program sea el programa activo. Es una consulta GL
+    sincrónica: solo se hace cuando realmente hay uniforms que enviar.
+    """
+    return glGetIntegerv(GL_CURRENT_PROGRAM) == shader_program
+
+
+def _changed(current: np.ndarray, value) -> tuple[np.ndarray, bool]:
+    """Convierte value a float32 y indica si difiere del valor actual."""
+    new = np.array(value, dtype=np.float32)
+    return new, not np.array_equal(new, current)
+
+
 class PointLight:
     """
     Representa una luz puntual simple para el motor.
@@ -42,6 +56,11 @@ class PointLight:
         self.intensity = float(intensity)
         # Rango máximo de iluminación (float, en unidades del mundo)
         self.range = float(range)
+        # Versión de los parámetros: cambia solo cuando set() modifica algún valor
+        self._version = 0
+        # Por programa: ubicaciones de los uniforms y versión ya enviada
+        self._locations = {}
+        self._uploaded = {}
 
     def set(self, position=None, color=None, intensity=None, range=None):
         """
@@ -51,35 +70,52 @@ class PointLight:
         - intensity: nuevo valor de intensidad (float)
         - range: nuevo rango de iluminación (float)
         """
+        changed = False
         if position is not None:
-            self.position = np.array(position, dtype=np.float32)
+            self.position, diff = _changed(self.position, position)
+            changed |= diff
         if color is not None:
-            self.color = np.array(color, dtype=np.float32)
-        if intensity is not None:
+            self.color, diff = _changed(self.color, color)
+            changed |= diff
+        if intensity is not None and float(intensity) != self.intensity:
             self.intensity = float(intensity)
-        if range is not None:
+            changed = True
+        if range is not None and float(range) != self.range:
             self.range = float(range)
+            changed = True
+        if changed:
+            self._version += 1
 
     def set_uniforms(self, shader_program):
         """
         Envía los parámetros de la luz puntual como uniformes al shader activo.
         IMPORTANTE: El shader debe estar activo (glUseProgram(shader_program)) antes de llamar a este método.
-        Si el shader no está activo, no se realiza ninguna operación y se registra una advertencia.
+        Los uniforms quedan guardados en el programa, así que solo se reenvían si la
+        luz cambió desde el último envío a ese programa. Si el shader no está activo,
+        no se envía nada (ni se marca como enviado) y se registra una advertencia.
         """
         if not shader_program:
             return
-        # Comprobación defensiva: ¿el shader está activo?
-        current_program = glGetIntegerv(GL_CURRENT_PROGRAM)
-        if current_program != shader_program:
+        if self._uploaded.get(shader_program) == self._version:
+            return
+        if not _is_bound(shader_program):
             logger.warning(
                 "Intento de setear uniformes de luz en un shader no activo. "
                 "Llama a glUseProgram(shader_program) antes de set_uniforms."
             )
             return
-        pos_loc = glGetUniformLocation(shader_program, "lightPosition")
-        color_loc = glGetUniformLocation(shader_program, "lightColor")
-        intensity_loc = glGetUniformLocation(shader_program, "lightIntensity")
-        range_loc = glGetUniformLocation(shader_program, "lightRange")
+        locs = self._locations.get(shader_program)
+        if locs is None:
+            locs = self._locations[shader_program] = tuple(
+                glGetUniformLocation(shader_program, name)
+                for name in (
+                    "lightPosition",
+                    "lightColor",
+                    "lightIntensity",
+                    "lightRange",
+                )
+            )
+        pos_loc, color_loc, intensity_loc, range_loc = locs
         if pos_loc != -1:
             glUniform3fv(pos_loc, 1, self.position)
         if color_loc != -1:
@@ -88,6 +124,7 @@ class PointLight:
             glUniform1f(intensity_loc, self.intensity)
         if range_loc != -1:
             glUniform1f(range_loc, self.range)
+        self._uploaded[shader_program] = self._version
 
 
 class GlobalLight:
@@ -99,6 +136,10 @@ class GlobalLight:
     def __init__(self, color=(1.0, 1.0, 1.0), intensity=0.3):
         self.color = np.array(color, dtype=np.float32)
         self.intensity = float(intensity)
+        # Igual que en PointLight: versión de los parámetros y estado por programa
+        self._version = 0
+        self._locations = {}
+        self._uploaded = {}
 
     def set(self, color=None, intensity=None):
         """
@@ -106,26 +147,39 @@ class GlobalLight:
         - color: tupla o array con el nuevo color (r, g, b)
         - intensity: nuevo valor de intensidad (float)
         """
+        changed = False
         if color is not None:
-            self.color = np.array(color, dtype=np.float32)
-        if intensity is not None:
+            self.color, changed = _changed(self.color, color)
+        if intensity is not None and float(intensity) != self.intensity:
             self.intensity = float(intensity)
+            changed = True
+        if changed:
+            self._version += 1
 
     def set_uniforms(self, shader_program):
         """
-        Envía los parámetros de la luz global como uniformes al shader activo.
+        Envía los parámetros de la luz global como uniformes al shader activo
+        (que debe estar enlazado con glUseProgram), solo si cambiaron desde el
+        último envío a ese programa. Con otro programa activo no se envía nada.
         """
         if not shader_program:
             return
-        current_program = glGetIntegerv(GL_CURRENT_PROGRAM)
-        if current_program != shader_program:
+        if self._uploaded.get(shader_program) == self._version:
+            return
+        if not _is_bound(shader_program):
             logger.warning(
                 "Intento de setear uniformes de luz global en un shader no activo."
             )
             return
-        color_loc = glGetUniformLocation(shader_program, "globalLightColor")
-        intensity_loc = glGetUniformLocation(shader_program, "globalLightIntensity")
+        locs = self._locations.get(shader_program)
+        if locs is None:
+            locs = self._locations[shader_program] = (
+                glGetUniformLocation(shader_program, "globalLightColor"),
+                glGetUniformLocation(shader_program, "globalLightIntensity"),
+            )
+        color_loc, intensity_loc = locs
         if color_loc != -1:
             glUniform3fv(color_loc, 1, self.color)
         if intensity_loc != -1:
             glUniform1f(intensity_loc, self.intensity)
+        self._uploaded[shader_program] = self._version
@@ -174,6 +174,138 @@ class WallModel(GLSLModel):
             pass
 
 
+class WallBatchModel(GLSLModel):
+    """
+    VBO persistente con los quads de todas las paredes del frame.
+    Se sube una vez por frame (mapeando el buffer mientras los datos entren en la
+    capacidad reservada) y se dibuja por rangos, uno por textura. La configuración de atributos
+    queda grabada en un VAO: cada frame basta con enlazarlo.
+    Los quads se dibujan como dos triángulos (0, 1, 2) (0, 2, 3) con un índice estático
+    que cubre toda la capacidad del VBO, en lugar de GL_QUADS.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.capacity = 0  # bytes reservados en el VBO
+        self.vao = None
+        self.ebo = None
+        self._vao_locs = None  # (pos_loc, uv_loc) grabados en el VAO para el VBO actual
+
+    def upload(self, vertex_data: np.ndarray):
+        """
+        Sube los vértices (N, 5) -> [x, y, z, u, v]. Solo se reasigna el buffer si crece.
+        """
+        nbytes = vertex_data.nbytes
+        if self.vbo is None or nbytes > self.capacity:
+            self.destroy_vbo()
+            self.capacity = max(nbytes, 2 * self.capacity)
+            self.vbo = glGenBuffers(1)
+            glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+            glBufferData(GL_ARRAY_BUFFER, self.capacity, None, GL_DYNAMIC_DRAW)
+            self._vao_locs = None  # El VAO apuntaba al buffer anterior
+        else:
+            glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        if nbytes:
+            self._write(np.ascontiguousarray(vertex_data, dtype=np.float32))
+        self.vertex_count = len(vertex_data)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    @staticmethod
+    def _write(vertex_data: np.ndarray):
+        """
+        Copia los vértices al VBO enlazado mapeándolo con invalidación: el driver puede
+        entregar memoria nueva en lugar de esperar a que la GPU termine el frame
+        anterior. Si el mapeo no está disponible se usa glBufferSubData.
+        """
+        nbytes = vertex_data.nbytes
+        ptr = glMapBufferRange(
+            GL_ARRAY_BUFFER, 0, nbytes, GL_MAP_WRITE_BIT | GL_MAP_INVALIDATE_BUFFER_BIT
+        )
+        if not ptr:
+            glBufferSubData(GL_ARRAY_BUFFER, 0, nbytes, vertex_data)
+            return
+        ctypes.memmove(ptr, vertex_data.ctypes.data, nbytes)
+        glUnmapBuffer(GL_ARRAY_BUFFER)
+
+    def begin(self, pos_loc, uv_loc):
+        """
+        Enlaza el VAO. Los punteros de atributos y el índice se graban solo al crear
+        o reasignar el VBO (o si cambian las ubicaciones del shader).
+        """
+        if self.vao is None:
+            self.vao = glGenVertexArrays(1)
+        glBindVertexArray(self.vao)
+        if self._vao_locs != (pos_loc, uv_loc):
+            self.bind()
+            glEnableVertexAttribArray(pos_loc)
+            glVertexAttribPointer(pos_loc, 3, GL_FLOAT, False, 20, ctypes.c_void_p(0))
+            glEnableVertexAttribArray(uv_loc)
+            glVertexAttribPointer(uv_loc, 2, GL_FLOAT, False, 20, ctypes.c_void_p(12))
+            self.unbind()
+
+            # Índices de todos los quads que entran en el VBO (80 bytes por quad)
+            quads = self.capacity // 80
+            indices = (
+                np.arange(4 * quads, dtype=np.uint32)
+                .reshape(-1, 4)[:, [0, 1, 2, 0, 2, 3]]
+                .ravel()
+            )
+            if self.ebo is None:
+                self.ebo = glGenBuffers(1)
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.ebo)
+            glBufferData(
+                GL_ELEMENT_ARRAY_BUFFER, indices.nbytes, indices, GL_STATIC_DRAW
+            )
+            self._vao_locs = (pos_loc, uv_loc)
+
+    def draw_range(self, first: int, count: int):
+        """
+        Dibuja count vértices (quads) a partir de first; ambos múltiplos de 4.
+        Cada quad son 6 índices uint32 (24 bytes) en el índice estático.
+        """
+        glDrawElements(
+            GL_TRIANGLES,
+            (count // 4) * 6,
+            GL_UNSIGNED_INT,
+            ctypes.c_void_p((first // 4) * 24),
+        )
+
+    def end(self, pos_loc, uv_loc):
+        """
+        Desenlaza el VAO; VBO y atributos se conservan para el próximo frame.
+        """
+        glBindVertexArray(0)
+
+    def destroy_vao(self):
+        """
+        Libera el VAO y su índice si existen.
+        """
+        if self.vao:
+            glDeleteVertexArrays(1, [self.vao])
+            self.vao = None
+            self._vao_locs = None
+        if self.ebo:
+            glDeleteBuffers(1, [self.ebo])
+            self.ebo = None
+
+    def destroy(self):
+        """
+        Libera VAO, índice y VBO. Debe llamarse con el contexto OpenGL activo
+        (al cerrar el renderer); el modelo vuelve a crearlos si se reutiliza.
+        """
+        try:
+            self.destroy_vao()
+        finally:
+            self.destroy_vbo()
+            self.capacity = 0
+
+    def __del__(self):
+        try:
+            self.destroy_vao()
+        finally:
+            super().__del__()
+
+
 class FloorModel(GLSLModel):
     """
     Modelo para renderizar un polígono de suelo.
@@ -4,7 +4,7 @@ Centraliza la lógica de generación de textura, gestión de fuente y renderizad
 """
 
 from dataclasses import dataclass, field
-from typing import Tuple, Dict
+from typing import Tuple, Dict, Optional
 from OpenGL.GL import *
 from PIL import Image, ImageDraw, ImageFont
 import numpy as np
@@ -121,9 +121,19 @@ class UILabel:
         self._texture_cache[key] = (tex_id, img_w, img_h)
         return tex_id, img_w, img_h
 
-    def draw(self, shader_program: int, width: int, height: int, vao: int):
+    def draw(
+        self,
+        shader_program: int,
+        width: int,
+        height: int,
+        vao: int,
+        projection: Optional[np.ndarray] = None,
+        locations: Optional[Dict[str, int]] = None,
+    ):
         """
         Renderiza la etiqueta usando el shader y el VAO proporcionados.
+        projection y locations (uniform -> ubicación) pueden venir ya calculados
+        por el llamador; si no, se calculan aquí.
         """
         tex_id, tex_w, tex_h = self.get_text_texture()
         x = self.x
@@ -135,26 +145,34 @@ class UILabel:
 
         glUseProgram(shader_program)
 
+        if locations is None:
+            locations = {
+                name: glGetUniformLocation(shader_program, name)
+                for name in (
+                    "projection",
+                    "labelPos",
+                    "labelSize",
+                    "textTexture",
+                    "useTexture",
+                )
+            }
+
         # Matriz de proyección ortográfica para pantalla completa
-        projection = np.array(
-            [
-                [2.0 / width, 0, 0, -1],
-                [0, -2.0 / height, 0, 1],
-                [0, 0, -1, 0],
-                [0, 0, 0, 1],
-            ],
-            dtype=np.float32,
-        ).T
-        glUniformMatrix4fv(
-            glGetUniformLocation(shader_program, "projection"),
-            1,
-            GL_FALSE,
-            projection,
-        )
+        if projection is None:
+            projection = np.array(
+                [
+                    [2.0 / width, 0, 0, -1],
+                    [0, -2.0 / height, 0, 1],
+                    [0, 0, -1, 0],
+                    [0, 0, 0, 1],
+                ],
+                dtype=np.float32,
+            ).T
+        glUniformMatrix4fv(locations["projection"], 1, GL_FALSE, projection)
 
         # Pasar uniforms de posición y tamaño de la etiqueta
-        glUniform2f(glGetUniformLocation(shader_program, "labelPos"), x, y)
-        glUniform2f(glGetUniformLocation(shader_program, "labelSize"), tex_w, tex_h)
+        glUniform2f(locations["labelPos"], x, y)
+        glUniform2f(locations["labelSize"], tex_w, tex_h)
 
         # Dibujar fondo semitransparente para mejorar legibilidad
         glEnable(GL_BLEND)
@@ -176,8 +194,8 @@ class UILabel:
         # Configurar textura y uniforms para el shader
         glActiveTexture(GL_TEXTURE0)
         glBindTexture(GL_TEXTURE_2D, tex_id)
-        glUniform1i(glGetUniformLocation(shader_program, "textTexture"), 0)
-        glUniform1i(glGetUniformLocation(shader_program, "useTexture"), 1)
+        glUniform1i(locations["textTexture"], 0)
+        glUniform1i(locations["useTexture"], 1)
 
         # Dibujar el quad usando el VAO/VBO configurado
         glBindVertexArray(vao)
@@ -156,6 +156,13 @@ class UIRenderer:
         glBindBuffer(GL_ARRAY_BUFFER, 0)
         glBindVertexArray(0)
 
+        # Estado cacheado del menú principal: uniforms y proyección por tamaño de ventana
+        self._menu_locs = None
+        self._label_locs = None
+        # Proyección ortográfica de pantalla compartida por menú y etiquetas
+        self._screen_projection = None
+        self._screen_projection_size = None
+
         # Diccionario para gestionar TextTextureManager por tamaño de fuente
         self._font_managers = {}
         # Inicializar el gestor de texturas de texto por defecto (36)
@@ -180,44 +187,32 @@ class UIRenderer:
         # Limpiar la pantalla y configurar OpenGL para UI
         glDisable(GL_DEPTH_TEST)
         glDisable(GL_CULL_FACE)
-        glClearColor(0.1, 0.1, 0.1, 1.0)
+        self.renderer.set_clear_color((0.1, 0.1, 0.1, 1.0))
         glClear(GL_COLOR_BUFFER_BIT)
 
         glUseProgram(self.shader)
+        loc = self._menu_uniform_locations()
 
-        # Matriz de proyección ortográfica
-        projection = np.array(
-            [
-                [2.0 / width, 0, 0, -1],
-                [0, -2.0 / height, 0, 1],
-                [0, 0, -1, 0],
-                [0, 0, 0, 1],
-            ],
-            dtype=np.float32,
-        ).T
-        glUniformMatrix4fv(
-            glGetUniformLocation(self.shader, "projection"), 1, GL_FALSE, projection
-        )
+        projection = self._projection_for(width, height)
+        glUniformMatrix4fv(loc["projection"], 1, GL_FALSE, projection)
 
         btn_w, btn_h = 300, 60
         spacing = 40
         start_y = height / 2 - (len(options) * (btn_h + spacing) - spacing) / 2
 
         glBindVertexArray(self.quad_vao)
+        glActiveTexture(GL_TEXTURE0)
+        glUniform1i(loc["textTexture"], 0)
 
+        # Matriz de modelo escala(btn_w, btn_h) * traslación(x, y): solo cambia la traslación
+        model = np.diag([btn_w, btn_h, 1, 1]).astype(np.float32)
         for i, opt in enumerate(options):
             x = (width - btn_w) / 2
             y = start_y + i * (btn_h + spacing)
 
-            # Matriz de modelo para escalar y posicionar el botón
-            scale_matrix = np.diag([btn_w, btn_h, 1, 1]).astype(np.float32)
-            trans_matrix = np.identity(4, dtype=np.float32)
-            trans_matrix[3, 0] = x
-            trans_matrix[3, 1] = y
-            model = scale_matrix @ trans_matrix
-            glUniformMatrix4fv(
-                glGetUniformLocation(self.shader, "model"), 1, GL_FALSE, model
-            )
+            model[3, 0] = x
+            model[3, 1] = y
+            glUniformMatrix4fv(loc["model"], 1, GL_FALSE, model)
 
             # Color de fondo del botón
             # CORREGIDO: El botón seleccionado ahora es blanco, los demás son grises
@@ -225,7 +220,7 @@ class UIRenderer:
                 color = (1.0, 1.0, 1.0)  # Blanco para el seleccionado
             else:
                 color = (0.5, 0.5, 0.5)  # Gris para los no seleccionados
-            glUniform3f(glGetUniformLocation(self.shader, "objectColor"), *color)
+            glUniform3f(loc["objectColor"], *color)
 
             # --- Renderizado del texto como textura ---
             if isinstance(opt, str):
@@ -248,26 +243,17 @@ class UIRenderer:
             offset_y = (1.0 - text_scale_y) / 2.0
 
             # Pasar uniforms para el shader
-            glActiveTexture(GL_TEXTURE0)
             glBindTexture(GL_TEXTURE_2D, tex_id)
-            glUniform1i(glGetUniformLocation(self.shader, "textTexture"), 0)
-            glUniform1i(glGetUniformLocation(self.shader, "useTexture"), 1)
-            glUniform2f(
-                glGetUniformLocation(self.shader, "textOffset"), offset_x, offset_y
-            )
-            glUniform2f(
-                glGetUniformLocation(self.shader, "textScale"),
-                text_scale_x,
-                text_scale_y,
-            )
+            glUniform1i(loc["useTexture"], 1)
+            glUniform2f(loc["textOffset"], offset_x, offset_y)
+            glUniform2f(loc["textScale"], text_scale_x, text_scale_y)
 
             # Dibujar el botón con textura de texto
             glDrawElements(GL_TRIANGLES, 6, GL_UNSIGNED_INT, None)
 
-            # Limpiar estado para el siguiente botón
-            glBindTexture(GL_TEXTURE_2D, 0)
-            glUniform1i(glGetUniformLocation(self.shader, "useTexture"), 0)
-
+        # Limpiar estado
+        glBindTexture(GL_TEXTURE_2D, 0)
+        glUniform1i(loc["useTexture"], 0)
         glBindVertexArray(0)
         glUseProgram(0)
 
@@ -275,14 +261,70 @@ class UIRenderer:
         if self.minimap_renderer:
             self.minimap_renderer.render()
 
+    def _projection_for(self, width: int, height: int) -> np.ndarray:
+        """
+        Matriz de proyección ortográfica de pantalla (origen arriba a la izquierda),
+        recalculada solo si cambia el tamaño de la ventana.
+        """
+        if self._screen_projection_size != (width, height):
+            self._screen_projection = np.array(
+                [
+                    [2.0 / width, 0, 0, -1],
+                    [0, -2.0 / height, 0, 1],
+                    [0, 0, -1, 0],
+                    [0, 0, 0, 1],
+                ],
+                dtype=np.float32,
+            ).T
+            self._screen_projection_size = (width, height)
+        return self._screen_projection
+
+    def _label_uniform_locations(self) -> dict:
+        """
+        Ubicaciones de los uniforms del shader de etiquetas, consultadas una sola vez.
+        """
+        if self._label_locs is None:
+            names = ("projection", "labelPos", "labelSize", "textTexture", "useTexture")
+            self._label_locs = {
+                name: glGetUniformLocation(self.label_shader, name) for name in names
+            }
+        return self._label_locs
+
+    def _menu_uniform_locations(self) -> dict:
+        """
+        Ubicaciones de los uniforms del shader de botones, consultadas una sola vez.
+        """
+        if self._menu_locs is None:
+            names = (
+                "projection",
+                "model",
+                "objectColor",
+                "textTexture",
+                "useTexture",
+                "textOffset",
+                "textScale",
+            )
+            self._menu_locs = {
+                name: glGetUniformLocation(self.shader, name) for name in names
+            }
+        return self._menu_locs
+
     def draw_label(self, label: UILabel, width: int, height: int):
         """
         Dibuja una etiqueta HUD usando el shader ui_label_shader_program.
-        Ahora delega toda la lógica a UILabel.draw, cumpliendo SOLID y DRY.
+        Ahora delega toda la lógica a UILabel.draw, cumpliendo SOLID y DRY; la
+        proyección y las ubicaciones de uniforms se pasan ya calculadas.
         """
         if not self.label_shader:
             return
-        label.draw(self.label_shader, width, height, self.label_vao)
+        label.draw(
+            self.label_shader,
+            width,
+            height,
+            self.label_vao,
+            projection=self._projection_for(width, height),
+            locations=self._label_uniform_locations(),
+        )
 
     def cleanup(self):
         """
@@ -7,14 +7,13 @@ from core.map_data import MapData
 from core._types import Segment
 from render import colors
 from render.glsl_models import (
-    WallModel,
+    WallBatchModel,
     FloorModel,
     CeilingModel,
 )  # <--- Importar modelos GLSL
 import settings
 
 from OpenGL.GL import *
-from OpenGL.GLU import gluPerspective
 
 import math
 import numpy as np
@@ -28,6 +27,41 @@ class WorldRenderer:
     def __init__(self, renderer):
         self.renderer = renderer  # Referencia al GLFWOpenGLRenderer
         self.theme = renderer.theme
+        # Paredes del minimapa: (SegmentArrays, vértices, colores por vértice)
+        self._minimap_cache = None
+        # VBO persistente de las paredes y ubicaciones de atributos/uniforms del shader
+        self._wall_batch = WallBatchModel()
+        self._wall_locs = None
+        # Ubicaciones de atributos/uniforms de los shaders de suelo y techo, por programa
+        self._surface_locs = {}
+        # Modelos de suelo (False) y techo (True): (MapData, escala, [(textura, modelo)])
+        self._sector_cache = {}
+        # Matrices 3D del frame (orden de columnas), calculadas en CPU
+        self._modelview = np.identity(4, dtype=np.float32)
+        self._projection = np.identity(4, dtype=np.float32)
+        self._projection_key = None
+        # Desplazamientos de los bordes del FOV respecto del jugador (minimapa);
+        # solo dependen del ángulo, el FOV y su largo, no de la posición
+        self._fov_offsets = np.zeros((4, 2), dtype=np.float32)
+        self._fov_offsets_key = None
+        # Círculo unitario de 32 lados para el jugador en el minimapa
+        angles = np.arange(32) * (2 * math.pi / 32)
+        self._unit_circle = np.stack([np.cos(angles), np.sin(angles)], axis=1).astype(
+            np.float32
+        )
+        # Grilla estática del plano XZ (depuración): se arma en el primer _draw_grid
+        self._grid_vertices = None
+
+    def cleanup(self) -> None:
+        """
+        Libera los buffers de OpenGL que el renderer conserva entre frames.
+        Debe llamarse antes de destruir el contexto (glfw.terminate).
+        """
+        self._wall_batch.destroy()
+        for _, _, models in self._sector_cache.values():
+            for _, model in models:
+                model.destroy_vbo()
+        self._sector_cache.clear()
 
     def draw_3d_world(self, camera, visible_segments: list[Segment], map_data: MapData):
         """
@@ -36,37 +70,21 @@ class WorldRenderer:
         """
         glEnable(GL_DEPTH_TEST)
         glEnable(GL_CULL_FACE)
-        self._setup_3d_projection(camera)
-
-        glMatrixMode(GL_MODELVIEW)
         glDepthFunc(GL_LESS)
-        glLoadIdentity()
 
-        # Usar la posición y ángulo de la cámara principal
-        glRotatef(camera.angle_deg + 90, 0.0, 1.0, 0.0)
-        glTranslatef(-camera.x, -settings.PLAYER_HEIGHT, -camera.z)
+        # Matrices del frame, calculadas en CPU: los shaders las reciben como uniforms
+        # y la pila de matrices fija de OpenGL no se usa en 3D
+        self._setup_3d_projection(camera)
+        # Usar la posición y ángulo de la cámara principal (matriz cacheada en la cámara)
+        self._modelview = camera.view_matrix(settings.PLAYER_HEIGHT)
 
         # --- Renderizado del mundo ---
         # Dibujar el suelo de los polígonos visibles
         self._draw_floors(map_data, visible_segments)
         self._draw_ceilings(map_data, visible_segments)
 
-        # Dibujar las paredes visibles, asegurando que cada segmento se dibuje solo una vez
-        drawn_segments = set()
-        if visible_segments:
-            for seg in visible_segments:
-                # Crea una clave única para cada segmento usando sus extremos y polígono
-                seg_key = (
-                    round(seg.a.x, 5),
-                    round(seg.a.y, 5),
-                    round(seg.b.x, 5),
-                    round(seg.b.y, 5),
-                    seg.polygon_name,
-                )
-                if seg_key in drawn_segments:
-                    continue
-                drawn_segments.add(seg_key)
-                self._draw_3d_wall(seg, camera)
+        # Dibujar las paredes visibles en un único lote
+        self._draw_walls(visible_segments, camera, map_data)
 
         # Dibujar grilla
         # self._draw_grid()
@@ -81,13 +99,9 @@ class WorldRenderer:
         glDisable(GL_DEPTH_TEST)
         glDisable(GL_CULL_FACE)
 
-        # Configurar proyección 2D
+        # Configurar proyección 2D y matriz de vista identidad
         self._setup_2d_projection()
 
-        # Configurar matrix de vista
-        glMatrixMode(GL_MODELVIEW)
-        glLoadIdentity()
-
         # Camara 2D
         self.renderer.camera.set_target(player.x, player.y)
         self.renderer.camera.apply_transform()
@@ -98,36 +112,48 @@ class WorldRenderer:
 
     def _setup_3d_projection(self, camera) -> None:
         """
-        Configura la matriz para la vista de la cámara principal en 3D.
+        Calcula la matriz de proyección de la cámara principal en 3D (self._projection).
         El FOV horizontal se toma directamente del atributo fov_deg de la cámara,
         que debe estar sincronizado con el jugador para evitar desincronización visual.
+        Se recalcula solo si cambian el FOV o el aspecto.
         """
-        glMatrixMode(GL_PROJECTION)
-        glLoadIdentity()
-
         width = self.renderer.width
         height = self.renderer.height
         aspect_ratio = width / height if height > 0 else 1.0
 
         # Usar SIEMPRE el FOV de la cámara (ya sincronizado con el jugador)
         horizontal_fov_deg = getattr(camera, "fov_deg", 90.0)
-        horizontal_fov_rad = math.radians(horizontal_fov_deg)
-        vertical_fov_rad = 2 * math.atan(
-            math.tan(horizontal_fov_rad / 2) / aspect_ratio
-        )
-        vertical_fov_deg = math.degrees(vertical_fov_rad)
+        key = (horizontal_fov_deg, aspect_ratio)
+        if key != self._projection_key:
+            self._projection = self._perspective_matrix(
+                horizontal_fov_deg, aspect_ratio, 0.1, 2000.0
+            )
+            self._projection_key = key
 
-        gluPerspective(vertical_fov_deg, aspect_ratio, 0.1, 2000.0)
+    @staticmethod
+    def _perspective_matrix(
+        horizontal_fov_deg: float, aspect_ratio: float, near: float, far: float
+    ) -> np.ndarray:
+        """
+        Matriz de gluPerspective (orden de columnas, float32) a partir del FOV horizontal:
+        con tan(fov_v / 2) = tan(fov_h / 2) / aspect, f / aspect = 1 / tan(fov_h / 2).
+        """
+        sx = 1.0 / math.tan(math.radians(horizontal_fov_deg) / 2)
+        m = np.zeros((4, 4), dtype=np.float32)
+        m[0, 0] = sx
+        m[1, 1] = sx * aspect_ratio
+        m[2, 2] = (far + near) / (near - far)
+        m[2, 3] = -1.0
+        m[3, 2] = 2.0 * far * near / (near - far)
+        return m
 
     def _setup_2d_projection(self):
         """
-        Configura la matriz para la vista 2D
+        Configura la matriz para la vista 2D: la misma ortográfica de pantalla que la
+        cámara del HUD, que la mantiene precalculada (se rehace solo al redimensionar).
+        Deja la matriz de vista en identidad.
         """
-        glMatrixMode(GL_PROJECTION)
-        glLoadIdentity()
-        width = self.renderer.width
-        height = self.renderer.height
-        glOrtho(0, width, 0, height, -1, 1)
+        self.renderer.hud_camera.apply_transform()
 
     def _draw_floors(self, map_data: MapData, visible_segments: list[Segment]):
         """
@@ -137,79 +163,10 @@ class WorldRenderer:
         shader = self.renderer.floor_shader_program
         if not shader or not map_data.polygons:
             return
-
-        glUseProgram(shader)
-
-        # Enviar uniforms de iluminación dinámica (luz puntual y global)
-        self.renderer.point_light.set_uniforms(shader)
-        self.renderer.global_light.set_uniforms(shader)
-
-        modelview = glGetFloatv(GL_MODELVIEW_MATRIX)
-        projection = glGetFloatv(GL_PROJECTION_MATRIX)
-        glUniformMatrix4fv(
-            glGetUniformLocation(shader, "modelview"), 1, GL_FALSE, modelview
-        )
-        glUniformMatrix4fv(
-            glGetUniformLocation(shader, "projection"), 1, GL_FALSE, projection
+        self._draw_sector_surfaces(
+            shader, self._sector_models(map_data, ceiling=False), "floor"
         )
 
-        use_texture_loc = glGetUniformLocation(shader, "useTexture")
-        color_loc = glGetUniformLocation(shader, "floorColor")
-        texture_sampler_loc = glGetUniformLocation(shader, "floorTexture")
-
-        tex_scale = (
-            settings.TEXTURE_SCALE if hasattr(settings, "TEXTURE_SCALE") else 1.0
-        )
-
-        # --- Dibuja el suelo solo para los polígonos principales ---
-        for poly_name, poly_vertices in map_data.polygons.items():
-            if not poly_vertices or len(poly_vertices) < 3:
-                continue
-
-            floor_texture_name = map_data.polygon_floor_textures.get(poly_name)
-            use_texture = floor_texture_name is not None
-
-            glUniform1i(use_texture_loc, GL_TRUE if use_texture else GL_FALSE)
-
-            if use_texture:
-                texture_id = self.renderer.texture_manager.get_gl_texture_id(
-                    floor_texture_name
-                )
-                glActiveTexture(GL_TEXTURE0)
-                glBindTexture(GL_TEXTURE_2D, texture_id)
-                glUniform1i(texture_sampler_loc, 0)
-            else:
-                floor_color_rgb = self.theme.get("floor", colors.DARK_GRAY)
-                floor_color_gl = [c / 255.0 for c in floor_color_rgb]
-                glUniform3f(color_loc, *floor_color_gl)
-
-            floor_h = 0.0
-            if hasattr(map_data, "sector_floor_h"):
-                floor_h = map_data.sector_floor_h.get(poly_name, 0.0)
-
-            # Preparación de Vértices (Posición + UVs)
-            vertex_data = []
-            for v in reversed(poly_vertices):
-                vertex_data.extend(
-                    [
-                        v.x,
-                        floor_h,
-                        v.y,
-                        v.x / tex_scale,
-                        v.y / tex_scale,
-                    ]
-                )
-            vertices = np.array(vertex_data, dtype=np.float32).reshape(-1, 5)
-
-            # Usar FloorModel para encapsular el VBO y el dibujado
-            model = FloorModel(vertices)
-            pos_loc = glGetAttribLocation(shader, "position")
-            uv_loc = glGetAttribLocation(shader, "texCoordIn")
-            model.draw(shader, pos_loc, uv_loc)
-            del model  # Libera el VBO
-
-        glUseProgram(0)
-
     def _draw_ceilings(self, map_data: MapData, visible_segments: list[Segment]):
         """
         Dibuja el techo de todos los polígonos principales (sectores) usando un shader dedicado para techos.
@@ -218,290 +175,475 @@ class WorldRenderer:
         shader = getattr(self.renderer, "ceiling_shader_program", None)
         if not shader or not map_data.polygons:
             return
+        self._draw_sector_surfaces(
+            shader, self._sector_models(map_data, ceiling=True), "ceiling"
+        )
 
+    def _draw_sector_surfaces(self, shader, models: list, theme_key: str) -> None:
+        """
+        Dibuja los polígonos de suelo o techo ya subidos a la GPU: por cada uno solo
+        cambian la textura (o el color de relleno) y se reutiliza su VBO.
+        """
         glUseProgram(shader)
 
         # Enviar uniforms de iluminación dinámica (luz puntual y global)
         self.renderer.point_light.set_uniforms(shader)
         self.renderer.global_light.set_uniforms(shader)
 
-        modelview = glGetFloatv(GL_MODELVIEW_MATRIX)
-        projection = glGetFloatv(GL_PROJECTION_MATRIX)
-        glUniformMatrix4fv(
-            glGetUniformLocation(shader, "modelview"), 1, GL_FALSE, modelview
-        )
-        glUniformMatrix4fv(
-            glGetUniformLocation(shader, "projection"), 1, GL_FALSE, projection
-        )
-
-        use_texture_loc = glGetUniformLocation(shader, "useTexture")
-        color_loc = glGetUniformLocation(shader, "floorColor")
-        texture_sampler_loc = glGetUniformLocation(shader, "floorTexture")
-
-        tex_scale = (
-            settings.TEXTURE_SCALE if hasattr(settings, "TEXTURE_SCALE") else 1.0
-        )
-
-        for poly_name, poly_vertices in map_data.polygons.items():
-            if not poly_vertices or len(poly_vertices) < 3:
-                continue
-
-            ceil_texture_name = None
-            if hasattr(map_data, "polygon_ceil_textures"):
-                ceil_texture_name = map_data.polygon_ceil_textures.get(poly_name)
-            use_texture = ceil_texture_name is not None
-
+        (
+            pos_loc,
+            uv_loc,
+            modelview_loc,
+            projection_loc,
+            use_texture_loc,
+            color_loc,
+            texture_sampler_loc,
+        ) = self._surface_locations(shader)
+        glUniformMatrix4fv(modelview_loc, 1, GL_FALSE, self._modelview)
+        glUniformMatrix4fv(projection_loc, 1, GL_FALSE, self._projection)
+
+        fill_color = None  # Solo se resuelve si algún polígono no tiene textura
+
+        for texture_name, model in models:
+            use_texture = texture_name is not None
             glUniform1i(use_texture_loc, GL_TRUE if use_texture else GL_FALSE)
 
             if use_texture:
                 texture_id = self.renderer.texture_manager.get_gl_texture_id(
-                    ceil_texture_name
+                    texture_name
                 )
                 glActiveTexture(GL_TEXTURE0)
                 glBindTexture(GL_TEXTURE_2D, texture_id)
                 glUniform1i(texture_sampler_loc, 0)
             else:
-                ceil_color_rgb = self.theme.get("ceiling", colors.LIGHT_GRAY)
-                ceil_color_gl = [c / 255.0 for c in ceil_color_rgb]
-                glUniform3f(color_loc, *ceil_color_gl)
-
-            ceil_h = 0.0
-            if hasattr(map_data, "sector_ceil_h"):
-                ceil_h = map_data.sector_ceil_h.get(poly_name, 0.0)
-
-            vertex_data = []
-            for v in poly_vertices:
-                vertex_data.extend(
-                    [
-                        v.x,
-                        ceil_h,
-                        v.y,
-                        v.x / tex_scale,
-                        v.y / tex_scale,
-                    ]
-                )
-            vertices = np.array(vertex_data, dtype=np.float32).reshape(-1, 5)
+                if fill_color is None:
+                    rgb = self.theme.get(
+                        theme_key,
+                        colors.DARK_GRAY if theme_key == "floor" else colors.LIGHT_GRAY,
+                    )
+                    fill_color = [c / 255.0 for c in rgb]
+                glUniform3f(color_loc, *fill_color)
 
-            # Usar CeilingModel para encapsular el VBO y el dibujado
-            model = CeilingModel(vertices)
-            pos_loc = glGetAttribLocation(shader, "position")
-            uv_loc = glGetAttribLocation(shader, "texCoordIn")
             model.draw(shader, pos_loc, uv_loc)
-            del model
 
         glUseProgram(0)
 
-    def _draw_3d_wall(self, seg: Segment, observer):
+    def _sector_models(self, map_data: MapData, ceiling: bool) -> list:
         """
-        Dibuja un segmento de pared en 3D solo si la cara visible está orientada hacia el observador.
+        Devuelve [(texture_name, FloorModel | CeilingModel)] de los polígonos del
+        mapa. La geometría es estática: los VBO se crean una vez por mapa (y escala
+        de textura) en lugar de crearse y destruirse en cada frame.
+        """
+        tex_scale = getattr(settings, "TEXTURE_SCALE", 1.0)
+        cache = self._sector_cache.get(ceiling)
+        if cache is not None and cache[0] is map_data and cache[1] == tex_scale:
+            return cache[2]
+
+        if ceiling:
+            textures = getattr(map_data, "polygon_ceil_textures", {})
+            heights = getattr(map_data, "sector_ceil_h", {})
+            model_cls = CeilingModel
+        else:
+            textures = map_data.polygon_floor_textures
+            heights = getattr(map_data, "sector_floor_h", {})
+            model_cls = FloorModel
+
+        models = []
+        for poly_name, poly_vertices in map_data.polygons.items():
+            if not poly_vertices or len(poly_vertices) < 3:
+                continue
+            xy = np.array([(v.x, v.y) for v in poly_vertices], dtype=np.float64)
+            if not ceiling:
+                # El suelo se recorre al revés para que su cara mire hacia arriba
+                xy = xy[::-1]
+            x, z = xy[:, 0], xy[:, 1]
+            h = np.full_like(x, heights.get(poly_name, 0.0))
+            vertices = np.column_stack([x, h, z, x / tex_scale, z / tex_scale])
+            models.append(
+                (textures.get(poly_name), model_cls(vertices.astype(np.float32)))
+            )
+
+        self._sector_cache[ceiling] = (map_data, tex_scale, models)
+        return models
+
+    def _draw_walls(self, visible_segments: list[Segment], observer, map_data: MapData):
+        """
+        Dibuja todas las paredes visibles con un solo VBO persistente: los quads se
+        agrupan por textura (un glBindTexture y un glDrawArrays por grupo), los uniforms
+        se envían una vez por frame y cada segmento se dibuja una sola vez.
         El parámetro observer puede ser Player o MainCamera, siempre que tenga .pos.
-        Soporta paredes sólidas y portales (divididas en secciones).
         """
-        # --- Lógica de visibilidad de la cara ---
-        wall_dx = seg.b.x - seg.a.x
-        wall_dy = seg.b.y - seg.a.y
-        normal_x = -wall_dy
-        normal_y = wall_dx
-        mid_x = (seg.a.x + seg.b.x) / 2
-        mid_y = (seg.a.y + seg.b.y) / 2
-        to_observer_x = observer.pos.x - mid_x
-        to_observer_y = observer.pos.y - mid_y
-        dot = normal_x * to_observer_x + normal_y * to_observer_y
-
-        visible = True
-        if seg.interior_facing is False:
-            visible = dot > 0
-        elif seg.interior_facing is True:
-            visible = dot < 0
-
-        if not visible:
+        shader = self.renderer.shader_program
+        if not shader or not visible_segments:
             return
 
-        shader = self.renderer.shader_program
-        if not shader:
+        tex_scale = getattr(settings, "TEXTURE_SCALE", 1.0)
+        vertices, ranges = self._build_wall_vertices(
+            map_data, visible_segments, observer.pos, tex_scale
+        )
+        if not ranges:
             return
+
         glUseProgram(shader)
 
         # Enviar uniforms de iluminación dinámica (luz puntual y global)
         self.renderer.point_light.set_uniforms(shader)
         self.renderer.global_light.set_uniforms(shader)
 
-        tex_scale = (
-            settings.TEXTURE_SCALE if hasattr(settings, "TEXTURE_SCALE") else 1.0
+        pos_loc, uv_loc, mv_loc, pr_loc, tex_loc = self._wall_locations(shader)
+        glUniformMatrix4fv(mv_loc, 1, GL_FALSE, self._modelview)
+        glUniformMatrix4fv(pr_loc, 1, GL_FALSE, self._projection)
+        glActiveTexture(GL_TEXTURE0)
+        glUniform1i(tex_loc, 0)
+
+        batch = self._wall_batch
+        batch.upload(vertices)
+        batch.begin(pos_loc, uv_loc)
+        for texture_name, first, count in ranges:
+            # Las paredes sin textura (primer rango) usan la textura 0, no la que
+            # haya quedado enlazada de la pasada de suelo o techo
+            if texture_name:
+                texture_id = self.renderer.texture_manager.get_gl_texture_id(
+                    texture_name
+                )
+                glBindTexture(GL_TEXTURE_2D, texture_id)
+            else:
+                glBindTexture(GL_TEXTURE_2D, 0)
+            batch.draw_range(first, count)
+        batch.end(pos_loc, uv_loc)
+
+        glUseProgram(0)
+
+    @staticmethod
+    def _build_wall_vertices(
+        map_data: MapData, visible_segments: list[Segment], obs, tex_scale: float
+    ) -> tuple[np.ndarray, list]:
+        """
+        Arma los vértices [x, y, z, u, v] (float32, 4 por quad) de las paredes visibles
+        orientadas hacia el observador, ordenados por textura, y los rangos
+        (texture_name, primer vértice, cantidad) de cada grupo.
+
+        Los segmentos del mapa se arman vectorizados sobre map_data.segment_arrays;
+        solo los portales con secciones (y segmentos ajenos al mapa) pasan por
+        _append_wall_quads, segmento a segmento.
+        """
+        arrays = map_data.segment_arrays
+        idx = arrays.indices_of(visible_segments)
+        foreign = WorldRenderer._front_facing_unique(
+            [seg for seg, k in zip(visible_segments, idx) if k < 0], obs
         )
-        u_start = seg.u_offset / tex_scale
-        u_end = (seg.u_offset + seg.length()) / tex_scale
+        idx = idx[idx >= 0]
 
-        p1, p2 = seg.a, seg.b
+        # Una sola vez por pared (mismos extremos y polígono), en orden de aparición
+        _, first = np.unique(arrays.draw_key[idx], return_index=True)
+        idx = idx[np.sort(first)]
 
-        # --- Renderizado de portales: solo upper y lower, nunca pared sólida ---
-        if getattr(seg, "wall_type", "solid") == "portal" and seg.portal_sections:
-            for section in seg.portal_sections:
-                # Solo dibujar upper y lower, omitir middle (hueco)
-                if section["section"] not in ("top", "bottom"):
-                    continue
-
-                y1a = section["h1_a"]
-                y1b = section["h1_b"]
-                y2a = section["h2_a"]
-                y2b = section["h2_b"]
-
-                v_start_a = y1a / tex_scale
-                v_start_b = y1b / tex_scale
-                v_end_a = y2a / tex_scale
-                v_end_b = y2b / tex_scale
-
-                vertices = np.array(
-                    [
-                        [p1.x, y1a, p1.y, u_start, v_start_a],  # Abajo-Izquierda
-                        [p2.x, y1b, p2.y, u_end, v_start_b],  # Abajo-Derecha
-                        [p2.x, y2b, p2.y, u_end, v_end_b],  # Arriba-Derecha
-                        [p1.x, y2a, p1.y, u_start, v_end_a],  # Arriba-Izquierda
-                    ],
-                    dtype=np.float32,
+        # --- Lógica de visibilidad de la cara ---
+        ax, ay = arrays.ax[idx], arrays.ay[idx]
+        bx, by = arrays.bx[idx], arrays.by[idx]
+        dot = (ay - by) * (obs.x - (ax + bx) * 0.5) + (bx - ax) * (
+            obs.y - (ay + by) * 0.5
+        )
+        facing = arrays.facing[idx]
+        front = (facing < 0) | ((facing == 0) & (dot > 0)) | ((facing == 1) & (dot < 0))
+        idx = idx[front]
+
+        # Paredes de un solo quad (sólidas y portales sin secciones), vectorizadas
+        simple = idx[~arrays.sectioned[idx]]
+        ax, ay = arrays.ax[simple], arrays.ay[simple]
+        bx, by = arrays.bx[simple], arrays.by[simple]
+        h1a, h1b, h2a, h2b = arrays.heights[:, simple]
+        # UV ya divididas por la escala de textura (precalculadas por mapa y escala)
+        u_start, u_end, v_all = arrays.scaled_uv(tex_scale)
+        u0, u1 = u_start[simple], u_end[simple]
+        v1a, v1b, v2a, v2b = v_all[:, simple]
+        # Abajo-Izquierda, Abajo-Derecha, Arriba-Derecha, Arriba-Izquierda
+        quads = np.stack(
+            [
+                np.stack([ax, bx, bx, ax], axis=1),
+                np.stack([h1a, h1b, h2b, h2a], axis=1),
+                np.stack([ay, by, by, ay], axis=1),
+                np.stack([u0, u1, u1, u0], axis=1),
+                np.stack([v1a, v1b, v2b, v2a], axis=1),
+            ],
+            axis=2,
+        ).astype(np.float32, copy=False)
+        names = list(arrays.texture_names)
+        quad_tex = arrays.tex_id[simple]
+
+        # Portales con secciones y segmentos ajenos: quads armados uno a uno
+        segments = map_data.segments
+        slow = [segments[k] for k in idx[arrays.sectioned[idx]]] + foreign
+        if slow:
+            tex_index = {name: k for k, name in enumerate(names)}
+            rows: list = []
+            slow_tex = []
+            for seg in slow:
+                before = len(rows)
+                WorldRenderer._append_wall_quads(rows, seg, tex_scale)
+                code = -1
+                if seg.texture_name:
+                    code = tex_index.setdefault(seg.texture_name, len(names))
+                    if code == len(names):
+                        names.append(seg.texture_name)
+                slow_tex.extend([code] * ((len(rows) - before) // 4))
+            if rows:
+                quads = np.concatenate(
+                    [quads, np.array(rows, dtype=np.float32).reshape(-1, 4, 5)]
+                )
+                quad_tex = np.concatenate(
+                    [quad_tex, np.array(slow_tex, dtype=np.int32)]
                 )
-                model = WallModel(vertices, wall_type="solid")
-                pos_loc = glGetAttribLocation(shader, "position")
-                uv_loc = glGetAttribLocation(shader, "texCoordIn")
 
-                if seg.texture_name:
-                    texture_id = self.renderer.texture_manager.get_gl_texture_id(
-                        seg.texture_name
-                    )
-                    glActiveTexture(GL_TEXTURE0)
-                    glBindTexture(GL_TEXTURE_2D, texture_id)
-                    tex_loc = glGetUniformLocation(shader, "wallTexture")
-                    glUniform1i(tex_loc, 0)
-
-                modelview = glGetFloatv(GL_MODELVIEW_MATRIX)
-                projection = glGetFloatv(GL_PROJECTION_MATRIX)
-                mv_loc = glGetUniformLocation(shader, "modelview")
-                pr_loc = glGetUniformLocation(shader, "projection")
-                glUniformMatrix4fv(mv_loc, 1, GL_FALSE, modelview)
-                glUniformMatrix4fv(pr_loc, 1, GL_FALSE, projection)
-
-                model.draw(shader, pos_loc, uv_loc)
-                del model  # Libera el VBO
-        else:
-            # Pared sólida (comportamiento actual)
-            y1a = getattr(seg, "portal_h1_a", 0.0)
-            y1b = getattr(seg, "portal_h1_b", 0.0)
-            y2a = getattr(
-                seg,
-                "portal_h2_a",
-                seg.height if seg.height is not None else settings.WALL_HEIGHT,
+        # Agrupar por textura: un rango contiguo de quads por grupo
+        order = np.argsort(quad_tex, kind="stable")
+        quad_tex = quad_tex[order]
+        vertices = quads[order].reshape(-1, 5)
+        starts = np.flatnonzero(np.diff(quad_tex, prepend=-2))
+        ends = np.append(starts[1:], len(quad_tex))
+        ranges = [
+            (names[quad_tex[a]] if quad_tex[a] >= 0 else None, 4 * a, 4 * (b - a))
+            for a, b in zip(starts.tolist(), ends.tolist())
+        ]
+        return vertices, ranges
+
+    @staticmethod
+    def _front_facing_unique(segments: list[Segment], obs) -> list[Segment]:
+        """
+        Versión por objetos del filtro de _build_wall_vertices: descarta repetidos
+        (mismos extremos y polígono) y caras que no miran al observador.
+        """
+        result = []
+        seen = set()
+        for seg in segments:
+            seg_key = (
+                round(seg.a.x, 5),
+                round(seg.a.y, 5),
+                round(seg.b.x, 5),
+                round(seg.b.y, 5),
+                seg.polygon_name,
             )
-            y2b = getattr(
-                seg,
-                "portal_h2_b",
-                seg.height if seg.height is not None else settings.WALL_HEIGHT,
+            if seg_key in seen:
+                continue
+            seen.add(seg_key)
+            dot = -seg.dy * (obs.x - (seg.a.x + seg.b.x) / 2) + seg.dx * (
+                obs.y - (seg.a.y + seg.b.y) / 2
             )
+            if seg.interior_facing is False and not dot > 0:
+                continue
+            if seg.interior_facing is True and not dot < 0:
+                continue
+            result.append(seg)
+        return result
 
-            v_start_a = y1a / tex_scale
-            v_start_b = y1b / tex_scale
-            v_end_a = y2a / tex_scale
-            v_end_b = y2b / tex_scale
-
-            vertices = np.array(
-                [
-                    [p1.x, y1a, p1.y, u_start, v_start_a],  # Abajo-Izquierda
-                    [p2.x, y1b, p2.y, u_end, v_start_b],  # Abajo-Derecha
-                    [p2.x, y2b, p2.y, u_end, v_end_b],  # Arriba-Derecha
-                    [p1.x, y2a, p1.y, u_start, v_end_a],  # Arriba-Izquierda
-                ],
-                dtype=np.float32,
+    def _surface_locations(self, shader) -> tuple:
+        """
+        Devuelve (position, texCoordIn, modelview, projection, useTexture, floorColor,
+        floorTexture) de los shaders de suelo y techo, consultados una sola vez por
+        programa.
+        """
+        locs = self._surface_locs.get(shader)
+        if locs is None:
+            locs = self._surface_locs[shader] = (
+                glGetAttribLocation(shader, "position"),
+                glGetAttribLocation(shader, "texCoordIn"),
+                glGetUniformLocation(shader, "modelview"),
+                glGetUniformLocation(shader, "projection"),
+                glGetUniformLocation(shader, "useTexture"),
+                glGetUniformLocation(shader, "floorColor"),
+                glGetUniformLocation(shader, "floorTexture"),
             )
+        return locs
 
-            model = WallModel(vertices)
-            pos_loc = glGetAttribLocation(shader, "position")
-            uv_loc = glGetAttribLocation(shader, "texCoordIn")
-
-            if seg.texture_name:
-                texture_id = self.renderer.texture_manager.get_gl_texture_id(
-                    seg.texture_name
-                )
-                glActiveTexture(GL_TEXTURE0)
-                glBindTexture(GL_TEXTURE_2D, texture_id)
-                tex_loc = glGetUniformLocation(shader, "wallTexture")
-                glUniform1i(tex_loc, 0)
+    def _wall_locations(self, shader) -> tuple:
+        """
+        Devuelve (position, texCoordIn, modelview, projection, wallTexture) del shader
+        de paredes, consultados una sola vez por programa.
+        """
+        if self._wall_locs is None or self._wall_locs[0] != shader:
+            self._wall_locs = (
+                shader,
+                glGetAttribLocation(shader, "position"),
+                glGetAttribLocation(shader, "texCoordIn"),
+                glGetUniformLocation(shader, "modelview"),
+                glGetUniformLocation(shader, "projection"),
+                glGetUniformLocation(shader, "wallTexture"),
+            )
+        return self._wall_locs[1:]
 
-            modelview = glGetFloatv(GL_MODELVIEW_MATRIX)
-            projection = glGetFloatv(GL_PROJECTION_MATRIX)
-            mv_loc = glGetUniformLocation(shader, "modelview")
-            pr_loc = glGetUniformLocation(shader, "projection")
-            glUniformMatrix4fv(mv_loc, 1, GL_FALSE, modelview)
-            glUniformMatrix4fv(pr_loc, 1, GL_FALSE, projection)
+    @staticmethod
+    def _append_wall_quads(rows: list, seg: Segment, tex_scale: float) -> None:
+        """
+        Agrega a rows los vértices [x, y, z, u, v] de los quads de un segmento.
+        Los portales aportan solo sus secciones top y bottom (middle es el hueco);
+        el resto se dibuja como pared sólida entre portal_h1 y portal_h2.
+        """
+        u_start = seg.u_offset / tex_scale
+        u_end = (seg.u_offset + seg.length()) / tex_scale
+        p1, p2 = seg.a, seg.b
 
-            model.draw(shader, pos_loc, uv_loc)
-            del model  # Libera el VBO
+        if seg.wall_type == "portal" and seg.portal_sections:
+            heights = [
+                (s["h1_a"], s["h1_b"], s["h2_a"], s["h2_b"])
+                for s in seg.portal_sections
+                if s["section"] in ("top", "bottom")
+            ]
+        else:
+            heights = [
+                (seg.portal_h1_a, seg.portal_h1_b, seg.portal_h2_a, seg.portal_h2_b)
+            ]
 
-        glUseProgram(0)
+        for y1a, y1b, y2a, y2b in heights:
+            rows.append((p1.x, y1a, p1.y, u_start, y1a / tex_scale))  # Abajo-Izquierda
+            rows.append((p2.x, y1b, p2.y, u_end, y1b / tex_scale))  # Abajo-Derecha
+            rows.append((p2.x, y2b, p2.y, u_end, y2b / tex_scale))  # Arriba-Derecha
+            rows.append((p1.x, y2a, p1.y, u_start, y2a / tex_scale))  # Arriba-Izquierda
 
     def _draw_grid(self):
-        """Dibuja una grilla en el plano XZ."""
+        """
+        Dibuja una grilla en el plano XZ (vértices precalculados, una sola llamada).
+        Usa el pipeline fijo, así que carga las matrices 3D del frame en la pila de OpenGL.
+        """
+        glMatrixMode(GL_PROJECTION)
+        glLoadMatrixf(self._projection)
+        glMatrixMode(GL_MODELVIEW)
+        glLoadMatrixf(self._modelview)
+        if self._grid_vertices is None:
+            self._grid_vertices = self._build_grid_vertices(grid_size=50, max_grid=1000)
         grid_color = colors.GRAY
-        glColor3f(grid_color[0] / 255.0, grid_color[1] / 255.0, grid_color[2] / 255.0)
-        glLineWidth(1.5)
-        grid_size = 50
-        max_grid = 1000
-
-        glBegin(GL_LINES)
-        for i in range(-max_grid, max_grid + grid_size, grid_size):
-            glVertex3f(i, 0, -max_grid)
-            glVertex3f(i, 0, max_grid)
-            glVertex3f(-max_grid, 0, i)
-            glVertex3f(max_grid, 0, i)
-        glEnd()
+        self._draw_lines(self._grid_vertices, grid_color, 1.5)
+
+    @staticmethod
+    def _build_grid_vertices(grid_size: int, max_grid: int) -> np.ndarray:
+        """Vértices (4 por coordenada, pares para GL_LINES) de la grilla en el plano XZ."""
+        i = np.arange(-max_grid, max_grid + grid_size, grid_size, dtype=np.float32)
+        lo = np.full_like(i, -max_grid)
+        hi = np.full_like(i, max_grid)
+        zero = np.zeros_like(i)
+        # Por cada i: (i, 0, -max) - (i, 0, max) y (-max, 0, i) - (max, 0, i)
+        return np.ascontiguousarray(
+            np.stack(
+                [
+                    np.stack([i, zero, lo], axis=1),
+                    np.stack([i, zero, hi], axis=1),
+                    np.stack([lo, zero, i], axis=1),
+                    np.stack([hi, zero, i], axis=1),
+                ],
+                axis=1,
+            ).reshape(-1, 3)
+        )
 
     def _draw_map(self, map_data, visible_segments):
-        for seg in map_data.segments:
-            self._draw_segment(seg, is_visible=False)
-        if visible_segments is not None:
-            for seg in visible_segments:
-                self._draw_segment(seg, is_visible=True)
-
-    def _draw_segment(self, seg, is_visible=False):
-        if is_visible and "visible_wall" in self.theme:
-            color = self.theme["visible_wall"]
-            width = 3.0
-        else:
-            color = (
-                self.theme["wall_interior"]
-                if seg.interior_facing
-                else self.theme["wall_exterior"]
-            )
-            width = 1.0
+        """
+        Dibuja todas las paredes del minimapa en una sola llamada (color por vértice)
+        en lugar de un glBegin/glEnd por segmento. Los segmentos visibles se resaltan
+        encima con una segunda llamada.
+        """
+        vertices, vertex_colors = self._minimap_wall_vertices(map_data)
+        self._draw_colored_lines(vertices, vertex_colors, 1.0)
+
+        # Sin color de resaltado, los visibles ya quedaron dibujados con su color normal
+        if visible_segments and "visible_wall" in self.theme:
+            arrays = map_data.segment_arrays
+            idx = arrays.indices_of(visible_segments)
+            if (idx >= 0).all():
+                # (4, N) -> (2N, 2): pares a, b tomados directamente de los arrays SoA
+                visible = np.ascontiguousarray(arrays.xy[:, idx].T).reshape(-1, 2)
+            else:
+                visible = np.array(
+                    [(s.a.x, s.a.y, s.b.x, s.b.y) for s in visible_segments],
+                    dtype=np.float32,
+                ).reshape(-1, 2)
+            self._draw_lines(visible, self.theme["visible_wall"], 3.0)
 
-        glColor3f(color[0] / 255.0, color[1] / 255.0, color[2] / 255.0)
+    def _minimap_wall_vertices(self, map_data) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Devuelve los vértices (pares a, b para GL_LINES) de todas las paredes y su
+        color por vértice (interiores primero, exteriores encima). Se arman una vez
+        por mapa a partir de map_data.segment_arrays.
+        """
+        arrays = map_data.segment_arrays
+        cache = self._minimap_cache
+        if cache is not None and cache[0] is arrays:
+            return cache[1], cache[2]
+
+        # (4, N) -> (N, 2, 2): por segmento, los puntos a y b
+        lines = np.ascontiguousarray(arrays.xy.T).reshape(-1, 2, 2)
+        interior = np.fromiter(
+            (bool(seg.interior_facing) for seg in map_data.segments),
+            dtype=bool,
+            count=len(arrays),
+        )
+        vertices = np.concatenate([lines[interior], lines[~interior]]).reshape(-1, 2)
+        n_interior = 2 * int(interior.sum())
+        vertex_colors = np.empty((len(vertices), 3), dtype=np.float32)
+        vertex_colors[:n_interior] = self.theme["wall_interior"]
+        vertex_colors[n_interior:] = self.theme["wall_exterior"]
+        vertex_colors /= 255.0
+        self._minimap_cache = (arrays, vertices, vertex_colors)
+        return vertices, vertex_colors
+
+    @staticmethod
+    def _draw_colored_lines(
+        vertices: np.ndarray, vertex_colors: np.ndarray, width: float
+    ) -> None:
+        """
+        Dibuja pares de vértices (N, 2) con GL_LINES y un color RGB (0..1) por
+        vértice, en una sola llamada.
+        """
+        if len(vertices) == 0:
+            return
         glLineWidth(width)
-        glBegin(GL_LINES)
-        glVertex2f(seg.a.x, seg.a.y)
-        glVertex2f(seg.b.x, seg.b.y)
-        glEnd()
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        glVertexPointer(2, GL_FLOAT, 0, vertices)
+        glColorPointer(3, GL_FLOAT, 0, vertex_colors)
+        glDrawArrays(GL_LINES, 0, len(vertices))
+        glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+
+    @staticmethod
+    def _draw_lines(
+        vertices: np.ndarray, color, width: float | None, mode=GL_LINES
+    ) -> None:
+        """
+        Dibuja vértices float32 de forma (N, 2) o (N, 3) en una sola llamada: pares
+        para GL_LINES (por defecto) o un contorno con GL_LINE_LOOP.
+        width None conserva el ancho de línea actual.
+        """
+        if len(vertices) == 0:
+            return
+        glColor3f(color[0] / 255.0, color[1] / 255.0, color[2] / 255.0)
+        if width is not None:
+            glLineWidth(width)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glVertexPointer(vertices.shape[1], GL_FLOAT, 0, vertices)
+        glDrawArrays(mode, 0, len(vertices))
+        glDisableClientState(GL_VERTEX_ARRAY)
 
     def _draw_player(self, player: Player):
         px, py = player.x, player.y
-        color = self.theme["player"]
-        glColor3f(color[0] / 255.0, color[1] / 255.0, color[2] / 255.0)
 
-        # Dibujar el círculo de colisión real del jugador
+        # Dibujar el círculo de colisión real del jugador (plantilla unitaria precalculada)
         player_radius = getattr(settings, "PLAYER_COLLISION_RADIUS", 16.0)
-        glBegin(GL_LINE_LOOP)
-        for i in range(32):
-            angle = (i / 32) * 2 * math.pi
-            glVertex2f(
-                px + math.cos(angle) * player_radius,
-                py + math.sin(angle) * player_radius,
+        circle = self._unit_circle * np.float32(player_radius)
+        circle += np.array((px, py), dtype=np.float32)
+        self._draw_lines(circle, self.theme["player"], None, GL_LINE_LOOP)
+
+        key = (player.angle_deg, player.fov_deg, player.fov_length)
+        if key != self._fov_offsets_key:
+            half = player.fov_deg / 2.0
+            a1 = math.radians(player.angle_deg - half)
+            a2 = math.radians(player.angle_deg + half)
+            # Filas: jugador, borde 1, jugador, borde 2 (pares para GL_LINES)
+            self._fov_offsets[1] = (
+                math.cos(a1) * player.fov_length,
+                math.sin(a1) * player.fov_length,
+            )
+            self._fov_offsets[3] = (
+                math.cos(a2) * player.fov_length,
+                math.sin(a2) * player.fov_length,
             )
-        glEnd()
-
-        e1, e2 = player.fov_edges()
-        color_fov = self.theme["fov"]
-        glColor3f(color_fov[0] / 255.0, color_fov[1] / 255.0, color_fov[2] / 255.0)
-        glLineWidth(1.0)
-        glBegin(GL_LINES)
-        glVertex2f(px, py)
-        glVertex2f(e1.x, e1.y)
-        glVertex2f(px, py)
-        glVertex2f(e2.x, e2.y)
-        glEnd()
+            self._fov_offsets_key = key
+        fov_lines = self._fov_offsets + np.array((px, py), dtype=np.float32)
+        self._draw_lines(fov_lines, self.theme["fov"], 1.0)
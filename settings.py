@@ -13,6 +13,8 @@ MAPS_DIR = ASSETS_DIR / "maps"
 TEXTURE_DIR = ASSETS_DIR / "textures"
 FONTS_DIR = ASSETS_DIR / "fonts"
 LOGS_DIR = BASE_DIR / "logs"
+# Binarios de programas de shaders compilados (se regeneran si cambia el driver)
+SHADER_CACHE_DIR = BASE_DIR / "cache" / "shaders"
 
 # Archivo de mapa por defecto
 DEFAULT_MAP_FILE = MAPS_DIR / "E1M1.xmap"
@@ -28,6 +30,9 @@ MINIMAP_SCALE = 2.0
 MINIMAP_MARGIN = 16
 ENABLE_MINIMAP = True
 COLOR_THEME = None
+# True: no se filtra la oclusión por raycast en CPU; el depth buffer de OpenGL
+# resuelve qué paredes tapan a cuáles (solo se descarta lo que está fuera del FOV)
+GPU_DEPTH_OCCLUSION = False
 
 # Mapa
 WALL_HEIGHT = 50.0
@@ -44,6 +49,7 @@ PLAYER_COLLISION_RADIUS = 8.0
 # Logging
 LOG_LEVEL = "DEBUG"  # DEBUG, INFO, WARNING, ERROR, CRITICAL
 LOG_FILE_BASENAME = "xoom.log"
+LOG_TO_CONSOLE = True  # False: solo archivo (menos latencia en el bucle del juego)
 LOG_ROTATE_DAILY = True
 LOG_BACKUP_COUNT = 1
 LOG_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
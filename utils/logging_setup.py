@@ -11,19 +11,38 @@ Uso:
 Luego usa logging.getLogger(__name__) en tus módulos.
 """
 
+import atexit
 import logging
+import logging.handlers
+import queue
 from pathlib import Path
 import settings
 
 _CONFIGURED = False
+# Hilo que escribe los registros encolados en los handlers reales (archivo/consola)
+_LISTENER: logging.handlers.QueueListener | None = None
+
+
+def _stop_listener() -> None:
+    """Vacía la cola y detiene el hilo de logging (se registra con atexit)."""
+    global _LISTENER
+    if _LISTENER is not None:
+        _LISTENER.stop()
+        for handler in _LISTENER.handlers:
+            handler.close()
+        _LISTENER = None
 
 
 def configure_logging(force: bool = False) -> None:
     """
     Configura el logging para que el archivo de log se sobrescriba en cada inicio.
     Elimina cualquier rotación y asegura que el archivo se borre y se cree de nuevo.
+
+    Los módulos solo encolan registros (QueueHandler); la escritura a archivo y a
+    consola ocurre en un hilo aparte (QueueListener), fuera del bucle del juego.
+    La salida a consola se controla con settings.LOG_TO_CONSOLE.
     """
-    global _CONFIGURED
+    global _CONFIGURED, _LISTENER
     if _CONFIGURED and not force:
         return
 
@@ -32,18 +51,36 @@ def configure_logging(force: bool = False) -> None:
 
     log_file = log_dir / settings.LOG_FILE_BASENAME
 
+    formatter = logging.Formatter(settings.LOG_FORMAT, datefmt=settings.DATE_FORMAT)
+
     # El modo 'w' sobrescribe el archivo de log cada vez que se inicia el programa.
     file_handler = logging.FileHandler(log_file, mode="w", encoding="utf-8")
+    file_handler.setFormatter(formatter)
+    handlers: list[logging.Handler] = [file_handler]
+
+    # También salida a consola, si está habilitada
+    if getattr(settings, "LOG_TO_CONSOLE", True):
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        handlers.append(console_handler)
 
-    # También salida a consola
-    console_handler = logging.StreamHandler()
+    # Reconfiguración: detener el listener anterior antes de crear uno nuevo
+    if _LISTENER is None:
+        atexit.register(_stop_listener)
+    else:
+        _stop_listener()
 
-    # Configuración básica del logging
-    logging.basicConfig(
-        level=getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO),
-        format=settings.LOG_FORMAT,
-        datefmt=settings.DATE_FORMAT,
-        handlers=[file_handler, console_handler],
-        force=True,  # asegura reconfiguración
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _LISTENER = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
     )
+    _LISTENER.start()
+
+    # El root logger solo encola; el formato lo aplican los handlers del listener
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO))
     _CONFIGURED = True
@@ -5,7 +5,6 @@ Funciones matemáticas auxiliares.
 from __future__ import annotations
 from typing import Iterable, List
 from core._types import Vec2, Segment
-import math
 
 
 def polygon_area_signed(points: Iterable[Vec2]) -> float:
@@ -25,9 +24,7 @@ def is_clockwise(points: Iterable[Vec2]) -> bool:
 
 
 def segment_length(seg: Segment) -> float:
-    dx = seg.b.x - seg.a.x
-    dy = seg.b.y - seg.a.y
-    return math.hypot(dx, dy)
+    return seg.length()
 
 
 def line_side(p: Vec2, a: Vec2, b: Vec2) -> float:
@@ -40,8 +37,16 @@ def line_side(p: Vec2, a: Vec2, b: Vec2) -> float:
 
 def split_segment(seg: Segment, a: Vec2, b: Vec2):
     """Divide un segmento por la línea (a,b) si cruza. Devuelve (front, back) listas de 0 o 1 segmentos."""
-    from_point = line_side(seg.a, a, b)
-    to_point = line_side(seg.b, a, b)
+    # Floats locales: mismos cálculos que line_side, sin accesos repetidos a atributos
+    ax, ay = a.x, a.y
+    ldx = b.x - ax
+    ldy = b.y - ay
+    sa = seg.a
+    sb = seg.b
+    sax, say = sa.x, sa.y
+    sbx, sby = sb.x, sb.y
+    from_point = ldx * (say - ay) - ldy * (sax - ax)
+    to_point = ldx * (sby - ay) - ldy * (sbx - ax)
 
     if from_point >= 0 and to_point >= 0:
         return [seg], []  # todo frente
@@ -49,16 +54,16 @@ def split_segment(seg: Segment, a: Vec2, b: Vec2):
         return [], [seg]  # todo atrás
 
     # cruza la línea -> encontrar intersección
-    denom = (seg.b.x - seg.a.x) * (b.y - a.y) - (seg.b.y - seg.a.y) * (b.x - a.x)
+    sdx = sbx - sax
+    sdy = sby - say
+    denom = sdx * ldy - sdy * ldx
     if denom == 0:  # líneas paralelas -> asignar arbitrariamente al frente
         return [seg], []
-    t = ((a.x - seg.a.x) * (b.y - a.y) - (a.y - seg.a.y) * (b.x - a.x)) / denom
-    ix = seg.a.x + t * (seg.b.x - seg.a.x)
-    iy = seg.a.y + t * (seg.b.y - seg.a.y)
-    inter = Vec2(ix, iy)
+    t = ((ax - sax) * ldy - (ay - say) * ldx) / denom
+    inter = Vec2(sax + t * sdx, say + t * sdy)
 
-    front_seg = Segment(seg.a, inter, seg.interior_facing)
-    back_seg = Segment(inter, seg.b, seg.interior_facing)
+    front_seg = Segment(sa, inter, seg.interior_facing)
+    back_seg = Segment(inter, sb, seg.interior_facing)
 
     if from_point > 0:
         return [front_seg], [back_seg]